@@ -5,7 +5,7 @@
     'author': 'Serhii Shi',
     'category': 'Services',
     'license': 'LGPL-3',
-    'version': '17.0.1.0.0',
+    'version': '17.0.1.0.1',
 
     'depends': [
         'base',
@@ -20,6 +20,8 @@
         'data/email_template.xml',
         'data/server_rental_invoice_sequence.xml',
         'data/ir_sequence_data.xml',
+        'data/ir_cron_data.xml',
+        'data/ir_config_parameter_data.xml',
 
         'views/it_outsource_menu_views.xml',
         'views/it_outsource_rental_product_views.xml',
@@ -28,12 +30,21 @@
         'views/it_outsource_payment_views.xml',
         'views/it_outsource_res_partner_views.xml',
         'views/it_outsource_service_act_views.xml',
+        'views/it_outsource_billing_job_views.xml',
+        'views/it_outsource_bank_statement_line_views.xml',
+        'views/it_outsource_usage_record_views.xml',
 
         'wizard/invoice_wizard_views.xml',
+        'wizard/payment_import_wizard_views.xml',
+        'wizard/server_allocation_wizard_views.xml',
+        'wizard/service_act_wizard_views.xml',
+        'wizard/invoice_export_wizard_views.xml',
 
         'report/invoice_report.xml',
         'report/invoice_report_template.xml',
         'report/service_report.xml',
+        'report/it_outsource_invoice_aging_report_views.xml',
+        'report/it_outsource_capacity_snapshot_views.xml',
 
         'data/demo_data.xml',
     ],
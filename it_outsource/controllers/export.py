@@ -0,0 +1,162 @@
+import csv
+import io
+import os
+import tempfile
+
+from odoo import api, fields, http, _
+from odoo.http import request, content_disposition
+from odoo.tools import SQL
+
+try:
+    import xlsxwriter
+except ImportError:
+    xlsxwriter = None
+
+EXPORT_CHUNK_SIZE = 2000
+STREAM_BLOCK_SIZE = 64 * 1024
+
+INVOICE_COLUMNS = [
+    ('inv.name', 'Invoice'),
+    ('inv.date', 'Invoice Date'),
+    ('inv.due_date', 'Due Date'),
+    ('inv.period_start', 'Billing Period'),
+    ('inv.state', 'Status'),
+    ('partner.name', 'Client'),
+    ('contract.name', 'Contract'),
+    ('currency.name', 'Currency'),
+    ('inv.amount', 'Amount'),
+    ('inv.paid_amount', 'Paid'),
+    ('inv.residual', 'Balance Due'),
+]
+LINE_COLUMNS = [
+    ('line.product_type', 'Type'),
+    ('product.name', 'Product'),
+    ('line.description', 'Description'),
+    ('line.quantity', 'Quantity'),
+    ('line.price_unit', 'Unit Price'),
+    ('line.amount', 'Line Amount'),
+]
+
+
+class InvoiceExportController(http.Controller):
+    """Streaming export of invoices and invoice lines.
+    Invoices are selected chunk by chunk with a keyset on their id, and the
+    rows of each chunk are written to the response before the next chunk is
+    read, so memory use does not depend on the number of exported rows.
+    """
+
+    def _get_domain(self, date_from=None, date_to=None, state=None):
+        domain = []
+        if date_from:
+            domain.append(('date', '>=', fields.Date.to_date(date_from)))
+        if date_to:
+            domain.append(('date', '<=', fields.Date.to_date(date_to)))
+        if state:
+            domain.append(('state', 'in', state.split(',')))
+        return domain
+
+    def _iter_rows(self, env, domain, with_lines, chunk_size=EXPORT_CHUNK_SIZE):
+        """Yield the exported rows, one chunk of invoices at a time.
+        Args:
+            env (Environment): Environment of the export cursor
+            domain (list): Domain of the exported invoices
+            with_lines (bool): One row per invoice line instead of per invoice
+            chunk_size (int): Number of invoices read per query
+        """
+        Invoice = env['it.outsource.invoice']
+        columns = INVOICE_COLUMNS + (LINE_COLUMNS if with_lines else [])
+        select = SQL(', '.join(column for column, _label in columns))
+        lines_join = SQL("""
+            JOIN it_outsource_invoice_line line ON line.invoice_id = inv.id
+       LEFT JOIN it_outsource_product product ON product.id = line.product_id
+        """ if with_lines else '')
+        order = SQL('inv.id, line.id' if with_lines else 'inv.id')
+        last_id = 0
+        while True:
+            query = Invoice._search(domain + [('id', '>', last_id)], limit=chunk_size, order='id')
+            env.cr.execute(query.select('"it_outsource_invoice".id'))
+            invoice_ids = [row[0] for row in env.cr.fetchall()]
+            if not invoice_ids:
+                return
+            env.cr.execute(SQL("""
+                SELECT %s
+                  FROM it_outsource_invoice inv
+                  JOIN it_outsource_contract contract ON contract.id = inv.contract_id
+             LEFT JOIN res_partner partner ON partner.id = inv.partner_id
+             LEFT JOIN res_currency currency ON currency.id = inv.currency_id
+                       %s
+                 WHERE inv.id = ANY(%s)
+              ORDER BY %s
+            """, select, lines_join, invoice_ids, order))
+            yield from env.cr.fetchall()
+            last_id = invoice_ids[-1]
+
+    def _stream_csv(self, rows, headers):
+        buffer = io.StringIO()
+        writer = csv.writer(buffer)
+        writer.writerow(headers)
+        for row in rows:
+            writer.writerow(row)
+            if buffer.tell() > STREAM_BLOCK_SIZE:
+                yield buffer.getvalue().encode()
+                buffer.seek(0)
+                buffer.truncate()
+        yield buffer.getvalue().encode()
+
+    def _stream_xlsx(self, rows, headers):
+        # XLSX is a zip archive that can only be streamed once complete: the
+        # sheet is written row by row to a temporary file, then sent by blocks.
+        with tempfile.TemporaryDirectory() as tmpdir:
+            path = os.path.join(tmpdir, 'export.xlsx')
+            workbook = xlsxwriter.Workbook(path, {
+                'constant_memory': True,
+                'default_date_format': 'yyyy-mm-dd',
+            })
+            sheet = workbook.add_worksheet()
+            sheet.write_row(0, 0, headers)
+            for index, row in enumerate(rows, start=1):
+                sheet.write_row(index, 0, row)
+            workbook.close()
+            with open(path, 'rb') as export_file:
+                while block := export_file.read(STREAM_BLOCK_SIZE):
+                    yield block
+
+    @http.route('/it_outsource/export/invoices', type='http', auth='user', methods=['GET'])
+    def export_invoices(self, file_format='csv', detail='line', **kwargs):
+        """Stream the invoices matching the filters as CSV or XLSX.
+        Query parameters: ``date_from`` and ``date_to`` (invoice date),
+        ``state`` (comma-separated states), ``detail`` (``line`` for one row
+        per invoice line, ``invoice`` for one row per invoice) and
+        ``file_format`` (``csv`` or ``xlsx``).
+        """
+        Invoice = request.env['it.outsource.invoice']
+        Invoice.check_access_rights('read')
+        request.env['it.outsource.invoice.line'].check_access_rights('read')
+        if file_format == 'xlsx' and not xlsxwriter:
+            return request.make_json_response(
+                {'error': _('XLSX export requires the xlsxwriter library.')}, status=400)
+        try:
+            domain = self._get_domain(kwargs.get('date_from'), kwargs.get('date_to'),
+                                      kwargs.get('state'))
+        except ValueError as e:
+            return request.make_json_response({'error': str(e)}, status=400)
+
+        with_lines = detail != 'invoice'
+        headers = [label for _column, label in INVOICE_COLUMNS + (LINE_COLUMNS if with_lines else [])]
+        registry, uid, context = request.env.registry, request.env.uid, dict(request.env.context)
+        stream = self._stream_xlsx if file_format == 'xlsx' else self._stream_csv
+
+        def generate():
+            # The request cursor is closed while the response is sent, the
+            # rows are read with a cursor of their own.
+            with registry.cursor() as cr:
+                env = api.Environment(cr, uid, context)
+                yield from stream(self._iter_rows(env, domain, with_lines), headers)
+
+        filename = 'invoices.%s' % ('xlsx' if file_format == 'xlsx' else 'csv')
+        mimetype = ('application/vnd.openxmlformats-officedocument.spreadsheetml.sheet'
+                    if file_format == 'xlsx' else 'text/csv; charset=utf-8')
+        return request.make_response(generate(), headers=[
+            ('Content-Type', mimetype),
+            ('Content-Disposition', content_disposition(filename)),
+        ])
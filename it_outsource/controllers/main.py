@@ -0,0 +1,118 @@
+from collections import defaultdict
+from datetime import datetime
+
+from odoo import http
+from odoo.http import request
+from odoo.tools import SQL
+
+DEFAULT_PAGE_SIZE = 500
+MAX_PAGE_SIZE = 5000
+
+CONTRACT_FIELDS = ['name', 'number', 'partner_id', 'start_date', 'end_date', 'state',
+                   'monthly_total', 'auto_renew', 'product_ids', 'write_date']
+INVOICE_FIELDS = ['name', 'contract_id', 'partner_id', 'date', 'due_date', 'period_start',
+                  'state', 'currency_id', 'amount', 'paid_amount', 'residual', 'write_date']
+INVOICE_LINE_FIELDS = ['invoice_id', 'product_type', 'product_id', 'description',
+                       'quantity', 'price_unit', 'amount']
+PAYMENT_FIELDS = ['name', 'invoice_id', 'partner_id', 'amount', 'payment_method', 'date',
+                  'state', 'write_date']
+
+
+class SyncController(http.Controller):
+    """JSON sync API of contracts, invoices and payments.
+    Records are returned in (write_date, id) order and paged with a keyset
+    cursor instead of an offset, so every page costs the same whatever its
+    depth. ``since`` starts an incremental sync from a modification date,
+    and the ``next_cursor`` of a page resumes after its last record.
+    """
+
+    def _parse_page_args(self, cursor=None, since=None, limit=None):
+        """Decode the paging parameters of a request.
+        Returns:
+            tuple: (cursor as (write_date, id) or None, since as datetime or
+            None, page size)
+        Raises:
+            ValueError: If a parameter is malformed
+        """
+        if cursor:
+            write_date, record_id = cursor.rsplit('_', 1)
+            cursor = (datetime.fromisoformat(write_date), int(record_id))
+        since = datetime.fromisoformat(since) if since else None
+        limit = min(max(int(limit or DEFAULT_PAGE_SIZE), 1), MAX_PAGE_SIZE)
+        return cursor, since, limit
+
+    def _search_page(self, model, cursor, since, limit):
+        """Select one page of records with a keyset condition.
+        Args:
+            model (str): Model name
+            cursor (tuple): (write_date, id) of the last record of the
+                previous page, or None
+            since (datetime): Only records modified from this date, or None
+            limit (int): Page size
+        Returns:
+            tuple: (records, next cursor or None)
+        """
+        Model = request.env[model]
+        table = Model._table
+        domain = [('write_date', '>=', since)] if since else []
+        query = Model._search(domain, limit=limit, order='write_date, id')
+        if cursor:
+            query.add_where(SQL('(%s, %s) > (%s, %s)',
+                                SQL.identifier(table, 'write_date'), SQL.identifier(table, 'id'),
+                                cursor[0], cursor[1]))
+        request.env.cr.execute(query.select(
+            SQL.identifier(table, 'id'), SQL.identifier(table, 'write_date')))
+        rows = request.env.cr.fetchall()
+        next_cursor = None
+        if len(rows) == limit:
+            record_id, write_date = rows[-1]
+            next_cursor = '%s_%s' % (write_date.isoformat(), record_id)
+        return Model.browse([row[0] for row in rows]), next_cursor
+
+    def _read_children(self, model, fields, parent_field, parent_ids):
+        """Read the children of a page of records in one query.
+        Returns:
+            dict: Parent id -> list of child values
+        """
+        children = defaultdict(list)
+        for vals in request.env[model].search_read(
+                [(parent_field, 'in', parent_ids)], fields, order='id', load=None):
+            children[vals[parent_field]].append(vals)
+        return children
+
+    def _page_response(self, model, fields, kwargs, embed=None):
+        try:
+            cursor, since, limit = self._parse_page_args(
+                kwargs.get('cursor'), kwargs.get('since'), kwargs.get('limit'))
+        except ValueError as e:
+            return request.make_json_response({'error': str(e)}, status=400)
+        records, next_cursor = self._search_page(model, cursor, since, limit)
+        values = records.read(fields, load=None)
+        if embed:
+            embed(values)
+        return request.make_json_response({
+            'records': values,
+            'next_cursor': next_cursor,
+        })
+
+    @http.route('/it_outsource/api/contracts', type='http', auth='user', methods=['GET'])
+    def contracts(self, **kwargs):
+        return self._page_response('it.outsource.contract', CONTRACT_FIELDS, kwargs)
+
+    @http.route('/it_outsource/api/invoices', type='http', auth='user', methods=['GET'])
+    def invoices(self, **kwargs):
+        def embed(values):
+            invoice_ids = [vals['id'] for vals in values]
+            lines = self._read_children(
+                'it.outsource.invoice.line', INVOICE_LINE_FIELDS, 'invoice_id', invoice_ids)
+            payments = self._read_children(
+                'it.outsource.payment', PAYMENT_FIELDS, 'invoice_id', invoice_ids)
+            for vals in values:
+                vals['lines'] = lines[vals['id']]
+                vals['payments'] = payments[vals['id']]
+
+        return self._page_response('it.outsource.invoice', INVOICE_FIELDS, kwargs, embed)
+
+    @http.route('/it_outsource/api/payments', type='http', auth='user', methods=['GET'])
+    def payments(self, **kwargs):
+        return self._page_response('it.outsource.payment', PAYMENT_FIELDS, kwargs)
@@ -0,0 +1,15 @@
+def migrate(cr, version):
+    """Fix the code of the service act sequence.
+    The sequence is loaded with noupdate, so the corrected code of the data
+    file is not applied to existing databases by the upgrade itself.
+    """
+    cr.execute("""
+        UPDATE ir_sequence seq
+           SET code = 'it.outsource.service.act'
+          FROM ir_model_data imd
+         WHERE imd.module = 'it_outsource'
+           AND imd.name = 'seq_service_report'
+           AND imd.model = 'ir.sequence'
+           AND imd.res_id = seq.id
+           AND seq.code = 'sit.outsource.service.act'
+    """)
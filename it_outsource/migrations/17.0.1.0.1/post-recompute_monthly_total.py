@@ -0,0 +1,25 @@
+from odoo import api, SUPERUSER_ID
+from odoo.tools import SQL
+
+
+def migrate(cr, version):
+    """Backfill the monthly total of existing contracts.
+    The column existed before the field became computed, so the upgrade
+    keeps its old values. Totals are recomputed for all rows with one
+    UPDATE over the contract products.
+    """
+    env = api.Environment(cr, SUPERUSER_ID, {})
+    field = env['it.outsource.contract']._fields['product_ids']
+    cr.execute(SQL(
+        """UPDATE it_outsource_contract contract
+              SET monthly_total = COALESCE(totals.total, 0)
+             FROM it_outsource_contract c
+        LEFT JOIN (SELECT rel.%(contract)s AS contract_id, SUM(product.price) AS total
+                     FROM %(relation)s rel
+                     JOIN it_outsource_product product ON product.id = rel.%(product)s
+                 GROUP BY rel.%(contract)s) totals ON totals.contract_id = c.id
+            WHERE c.id = contract.id""",
+        contract=SQL.identifier(field.column1),
+        product=SQL.identifier(field.column2),
+        relation=SQL.identifier(field.relation),
+    ))
@@ -1,8 +1,16 @@
-from . import (it_outsource_rental_product,
+from . import (it_outsource_report_mixin,
+               it_outsource_rental_product,
                it_outsource_contract,
                it_outsource_invoice,
                it_outsource_invoice_line,
                it_outsource_payment,
                it_outsource_service_act,
                it_outsource_service_act_line,
-               res_partner)
+               res_partner,
+               it_outsource_billing_job,
+               it_outsource_bank_statement_line,
+               it_outsource_usage_record,
+               ir_sequence,
+               ir_actions_report,
+               account_move,
+               account_payment)
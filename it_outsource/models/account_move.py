@@ -0,0 +1,18 @@
+from odoo import models, fields
+
+
+class AccountMove(models.Model):
+    """Journal entry extension for IT outsourcing.
+    This class links customer invoices posted by the accounting bridge back
+    to the rental invoice they were generated from.
+    """
+
+    _inherit = 'account.move'
+
+    it_outsource_invoice_id = fields.Many2one(
+        comodel_name='it.outsource.invoice',
+        string='Rental Invoice',
+        readonly=True,
+        copy=False,
+        index='btree_not_null',
+        ondelete='restrict')
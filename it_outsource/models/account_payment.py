@@ -0,0 +1,18 @@
+from odoo import models, fields
+
+
+class AccountPayment(models.Model):
+    """Payment extension for IT outsourcing.
+    This class links payments posted by the accounting bridge back to the
+    rental payment they were generated from.
+    """
+
+    _inherit = 'account.payment'
+
+    it_outsource_payment_id = fields.Many2one(
+        comodel_name='it.outsource.payment',
+        string='Rental Payment',
+        readonly=True,
+        copy=False,
+        index='btree_not_null',
+        ondelete='restrict')
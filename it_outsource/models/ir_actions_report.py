@@ -0,0 +1,18 @@
+from odoo import models
+
+
+class IrActionsReport(models.Model):
+    """Report extension removing outdated cached PDFs.
+    Documents printed through the report mixin store a new PDF whenever
+    their content changes. The PDF of the previous content is removed when
+    the new one is stored, so each document keeps a single cached PDF.
+    """
+
+    _inherit = 'ir.actions.report'
+
+    def _prepare_pdf_report_attachment_vals_list(self, report, streams):
+        vals_list = super()._prepare_pdf_report_attachment_vals_list(report, streams)
+        Model = self.env[report.model]
+        if vals_list and isinstance(Model, self.pool['it.outsource.report.mixin']):
+            Model.browse([vals['res_id'] for vals in vals_list])._unlink_stale_report_attachments()
+        return vals_list
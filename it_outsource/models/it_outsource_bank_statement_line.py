@@ -0,0 +1,357 @@
+from collections import defaultdict
+
+from odoo import models, fields, api, Command
+from odoo.tools import split_every
+
+IMPORT_BATCH_SIZE = 2000
+# Matches scoring at least this much are applied without review
+AUTO_APPLY_SCORE = 80
+# Maximum number of invoices a single transfer is matched against
+MAX_COMBINED_INVOICES = 5
+
+
+def _amount_key(amount):
+    return int(round(amount * 100))
+
+
+class BankStatementLine(models.Model):
+    """Bank statement line model for IT outsourcing.
+    This class keeps the incoming bank transfers of imported bank statements.
+    Transfers referencing an invoice number are turned into payments while
+    importing, the other lines are matched to open invoices by the matching
+    engine, which scores candidates by client and amount. A transfer is
+    imported once, whatever the number of statements it appears in, as
+    identified by its unique import id.
+    """
+    _name = 'it.outsource.bank.statement.line'
+    _description = 'Bank Statement Line'
+    _order = 'date desc, id desc'
+
+    import_ref = fields.Char(
+        string='Import',
+        index=True,
+        readonly=True,
+        help='Statement import this line comes from'
+    )
+    unique_import_id = fields.Char(
+        readonly=True,
+        copy=False,
+        help='Transaction id given by the bank, or the hash of the statement '
+             'file and the position of the transfer in it'
+    )
+    date = fields.Date(required=True)
+    amount = fields.Float(required=True)
+    reference = fields.Char(help='Payment reference given by the payer')
+    partner_name = fields.Char(string='Payer')
+    account_number = fields.Char(
+        string='Payer Account',
+        help='Bank account the transfer was made from'
+    )
+    partner_id = fields.Many2one(
+        comodel_name='res.partner',
+        string='Client',
+        help='Client recognised from the payer name'
+    )
+    state = fields.Selection([
+        ('unmatched', 'Unmatched'),
+        ('proposed', 'Proposed'),
+        ('matched', 'Matched')
+    ], string='Status', default='unmatched', required=True)
+    match_invoice_ids = fields.Many2many(
+        comodel_name='it.outsource.invoice',
+        string='Proposed Invoices',
+        help='Invoices proposed by the matching engine, oldest first'
+    )
+    match_type = fields.Selection([
+        ('exact', 'Exact Balance'),
+        ('combined', 'Several Invoices'),
+        ('partial', 'Partial Payment')
+    ], readonly=True)
+    match_score = fields.Integer(
+        readonly=True,
+        help='Confidence of the proposed match, from 0 to 100'
+    )
+    payment_ids = fields.One2many(
+        comodel_name='it.outsource.payment',
+        inverse_name='statement_line_id',
+        string='Payments'
+    )
+
+    def init(self):
+        # A transfer is imported once; lines created by hand are not constrained
+        self.env.cr.execute("""
+            CREATE UNIQUE INDEX IF NOT EXISTS it_outsource_bank_statement_line_unique_import_id_uniq
+                ON it_outsource_bank_statement_line (unique_import_id)
+             WHERE unique_import_id IS NOT NULL
+        """)
+
+    @api.model
+    def _import_rows(self, rows, import_ref, batch_size=IMPORT_BATCH_SIZE):
+        """Import bank statement rows in batches.
+        Rows are consumed lazily ``batch_size`` at a time. For every batch the
+        already imported transfers, the invoices by number and the clients
+        by name are looked up with one query each. A statement line is
+        created for every new transfer with one create() call, and the
+        transfers referencing an invoice are applied to it like the matches
+        of the matching engine, as confirmed payments of their line.
+        Args:
+            rows (iterable): Dictionaries with ``unique_import_id``, ``date``,
+                ``amount``, ``reference``, ``partner_name`` and
+                ``account_number`` keys
+            import_ref (str): Label of the import stored on the lines
+            batch_size (int): Number of rows processed per batch
+        Returns:
+            dict: Number of ``matched``, ``unmatched``, ``skipped`` and
+            ``duplicate`` rows
+        """
+        summary = {'matched': 0, 'unmatched': 0, 'skipped': 0, 'duplicate': 0}
+        for batch in split_every(batch_size, rows, list):
+            incoming = [row for row in batch if row['amount'] > 0]
+            summary['skipped'] += len(batch) - len(incoming)
+
+            seen = self._get_imported_keys(incoming)
+            new_rows = []
+            for row in incoming:
+                key = row.get('unique_import_id')
+                if key in seen:
+                    summary['duplicate'] += 1
+                    continue
+                if key:
+                    seen.add(key)
+                new_rows.append(row)
+
+            invoice_ids = self._map_invoice_numbers(new_rows)
+            partner_ids = self._map_partner_names(new_rows)
+            row_invoice_ids = [
+                next((invoice_ids[token] for token in (row['reference'] or '').split()
+                      if token in invoice_ids), False)
+                for row in new_rows
+            ]
+            lines = self.create([{
+                'import_ref': import_ref,
+                'unique_import_id': row.get('unique_import_id') or False,
+                'date': row['date'],
+                'amount': row['amount'],
+                'reference': row['reference'],
+                'partner_name': row['partner_name'],
+                'account_number': row.get('account_number') or False,
+                'partner_id': partner_ids.get(row['partner_name'], False),
+                'state': 'proposed' if invoice_id else 'unmatched',
+                'match_invoice_ids': [Command.set([invoice_id] if invoice_id else [])],
+            } for row, invoice_id in zip(new_rows, row_invoice_ids)])
+            lines._apply_matches({
+                line: [invoice_id]
+                for line, invoice_id in zip(lines, row_invoice_ids) if invoice_id
+            })
+            matched_count = len(lines.filtered(lambda line: line.state == 'matched'))
+            summary['matched'] += matched_count
+            summary['unmatched'] += len(lines) - matched_count
+
+            # keep memory flat whatever the size of the statement
+            self.env.flush_all()
+            self.env.invalidate_all()
+        return summary
+
+    @api.model
+    def _get_imported_keys(self, rows):
+        """Return the unique import ids of the rows already imported.
+        Args:
+            rows (list): Statement rows
+        Returns:
+            set: Unique import ids of the rows matching an imported line
+        """
+        keys = {row['unique_import_id'] for row in rows if row.get('unique_import_id')}
+        if not keys:
+            return set()
+        self.flush_model(['unique_import_id'])
+        self.env.cr.execute("""
+            SELECT unique_import_id
+              FROM it_outsource_bank_statement_line
+             WHERE unique_import_id IN %s
+        """, [tuple(keys)])
+        return {key for key, in self.env.cr.fetchall()}
+
+    @api.model
+    def _map_invoice_numbers(self, rows):
+        tokens = {token for row in rows for token in (row['reference'] or '').split()}
+        if not tokens:
+            return {}
+        invoices = self.env['it.outsource.invoice'].search_read(
+            [('name', 'in', list(tokens))], ['name'])
+        return {invoice['name']: invoice['id'] for invoice in invoices}
+
+    @api.model
+    def _map_partner_names(self, rows):
+        names = {row['partner_name'] for row in rows if row['partner_name']}
+        if not names:
+            return {}
+        partners = self.env['res.partner'].search_read(
+            [('name', 'in', list(names))], ['name'])
+        return {partner['name']: partner['id'] for partner in partners}
+
+    def action_match(self):
+        """Propose invoices for the unmatched lines, applying sure matches."""
+        self.filtered(lambda line: line.state == 'unmatched')._match_invoices()
+
+    def action_apply_match(self):
+        """Apply the proposed matches of the selected lines."""
+        lines = self.filtered(lambda line: line.state == 'proposed' and line.match_invoice_ids)
+        lines._apply_matches({
+            line: line.match_invoice_ids.sorted(lambda invoice: (invoice.due_date, invoice.id)).ids
+            for line in lines
+        })
+
+    def _match_invoices(self, auto_apply_score=AUTO_APPLY_SCORE):
+        """Match the lines to open invoices in one pass.
+        Open invoices are loaded once and indexed in memory by client, by
+        client and residual and by residual alone. Each line is then scored
+        against the indexes without querying the database:
+
+        - exact: an invoice of the client has exactly the transferred
+          balance (100), or a single invoice of any client when the payer
+          is unknown (60)
+        - combined: the oldest open invoices of the client add up exactly
+          to the transferred amount (80)
+        - partial: the amount is below the balance of the oldest invoice of
+          the client (40)
+
+        Matched balances are consumed in memory, so two lines of the batch
+        never claim the same balance. Matches scoring at least
+        ``auto_apply_score`` are applied, the others are proposed. Proposals
+        are written with one write() per match type, score and set of
+        proposed invoices.
+        Args:
+            auto_apply_score (int): Minimum score of matches applied directly
+        """
+        index = self._load_open_invoices()
+        to_apply = {}
+        proposals = defaultdict(list)
+        for line in self:
+            match = self._find_match(index, line.partner_id.id, _amount_key(line.amount))
+            if not match:
+                continue
+            match_type, score, invoice_ids = match
+            if score >= auto_apply_score:
+                to_apply[line] = invoice_ids
+            proposals[match_type, score, tuple(invoice_ids)].append(line.id)
+        for (match_type, score, invoice_ids), line_ids in proposals.items():
+            self.browse(line_ids).write({
+                'state': 'proposed',
+                'match_type': match_type,
+                'match_score': score,
+                'match_invoice_ids': [Command.set(invoice_ids)],
+            })
+        self._apply_matches(to_apply)
+
+    def _load_open_invoices(self):
+        """Load open invoices and build the in-memory matching indexes.
+        Returns:
+            dict: ``residual`` (invoice id -> residual in cents), ``by_partner``
+            (partner id -> invoice ids, oldest first), ``by_partner_residual``
+            and ``by_residual`` (key -> invoice ids)
+        """
+        domain = [('residual', '>', 0), ('state', 'in', ('draft', 'sent'))]
+        if all(line.partner_id for line in self):
+            domain.append(('partner_id', 'in', self.partner_id.ids))
+        invoices = self.env['it.outsource.invoice'].search_read(
+            domain, ['partner_id', 'residual'], order='due_date, id', load=None)
+
+        index = {
+            'residual': {},
+            'by_partner': defaultdict(list),
+            'by_partner_residual': defaultdict(list),
+            'by_residual': defaultdict(list),
+        }
+        for invoice in invoices:
+            residual = _amount_key(invoice['residual'])
+            index['residual'][invoice['id']] = residual
+            index['by_partner'][invoice['partner_id']].append(invoice['id'])
+            index['by_partner_residual'][invoice['partner_id'], residual].append(invoice['id'])
+            index['by_residual'][residual].append(invoice['id'])
+        return index
+
+    @api.model
+    def _find_match(self, index, partner_id, amount):
+        """Find the best match of an amount in the indexes and consume it.
+        Args:
+            index (dict): Indexes built by _load_open_invoices()
+            partner_id (int): Client of the transfer, if known
+            amount (int): Transferred amount in cents
+        Returns:
+            tuple: (match type, score, invoice ids), or None
+        """
+        residual = index['residual']
+
+        def is_open(invoice_id):
+            return residual[invoice_id] > 0
+
+        def consume(invoice_ids):
+            remaining = amount
+            for invoice_id in invoice_ids:
+                allocated = min(remaining, residual[invoice_id])
+                residual[invoice_id] -= allocated
+                remaining -= allocated
+            return invoice_ids
+
+        if partner_id:
+            exact = [inv for inv in index['by_partner_residual'][partner_id, amount]
+                     if residual[inv] == amount]
+            if exact:
+                return 'exact', 100, consume(exact[:1])
+
+            open_ids = [inv for inv in index['by_partner'][partner_id] if is_open(inv)]
+            total = 0
+            for count, invoice_id in enumerate(open_ids[:MAX_COMBINED_INVOICES], start=1):
+                total += residual[invoice_id]
+                if total == amount and count > 1:
+                    return 'combined', 80, consume(open_ids[:count])
+                if total > amount:
+                    break
+            if open_ids and amount < residual[open_ids[0]]:
+                return 'partial', 40, consume(open_ids[:1])
+            return None
+
+        exact = [inv for inv in index['by_residual'][amount] if residual[inv] == amount]
+        if len(exact) == 1:
+            return 'exact', 60, consume(exact)
+        return None
+
+    def _apply_matches(self, matches):
+        """Turn matched lines into confirmed payments.
+        The amount of each line not yet paid out is allocated to its
+        invoices oldest first, all payments are created with one create()
+        call and confirmed in one batch, and the fully allocated lines are
+        marked matched in one write. Lines whose amount exceeds the residual
+        of their invoices stay proposed with the payments made so far.
+        Args:
+            matches (dict): Statement line -> list of invoice ids
+        """
+        if not matches:
+            return
+        Invoice = self.env['it.outsource.invoice']
+        invoices = Invoice.browse({inv for invoice_ids in matches.values() for inv in invoice_ids})
+        residual = {invoice.id: invoice.residual for invoice in invoices}
+
+        payment_vals = []
+        allocated_line_ids = []
+        for line, invoice_ids in matches.items():
+            remaining = line.amount - sum(
+                line.payment_ids.filtered(lambda payment: payment.state == 'confirmed').mapped('amount'))
+            for invoice_id in invoice_ids:
+                allocated = min(remaining, residual[invoice_id])
+                if allocated <= 0:
+                    continue
+                residual[invoice_id] -= allocated
+                remaining -= allocated
+                payment_vals.append({
+                    'invoice_id': invoice_id,
+                    'statement_line_id': line.id,
+                    'amount': allocated,
+                    'date': line.date,
+                    'payment_method': 'bank',
+                    'notes': line.reference,
+                })
+            if _amount_key(remaining) <= 0:
+                allocated_line_ids.append(line.id)
+        self.env['it.outsource.payment'].create(payment_vals).action_confirm()
+        self.browse(allocated_line_ids).write({'state': 'matched'})
@@ -0,0 +1,294 @@
+import logging
+import threading
+
+from psycopg2 import errors
+
+from odoo import models, fields, api, _
+from odoo.exceptions import ValidationError
+from odoo.tools import SQL, date_utils
+
+_logger = logging.getLogger(__name__)
+
+BILLING_CHUNK_SIZE = 500
+BILLING_CRON_XMLIDS = [
+    'it_outsource.ir_cron_billing_job',
+    'it_outsource.ir_cron_billing_job_worker_2',
+    'it_outsource.ir_cron_billing_job_worker_3',
+    'it_outsource.ir_cron_billing_job_worker_4',
+]
+
+
+class BillingJob(models.Model):
+    """Billing job model for IT outsourcing.
+    This class represents a scheduled billing run. Contracts are billed by
+    one or more cron workers in fixed-size chunks that are committed one by
+    one. Workers claim disjoint chunks with row-level locks, and contracts
+    already billed by the job are skipped, so an interrupted run resumes
+    where it stopped.
+    """
+    _name = 'it.outsource.billing.job'
+    _description = 'Billing Job'
+    _order = 'id desc'
+
+    name = fields.Char(
+        compute='_compute_name',
+        store=True,
+        help='Name of the billing run'
+    )
+
+    date = fields.Date(
+        string='Invoice Date',
+        required=True,
+        default=fields.Date.context_today,
+        help='Date of the generated invoices'
+    )
+    include_active = fields.Boolean(
+        string='Include Active Contracts',
+        default=True)
+    include_expiring = fields.Boolean(string='Include Expiring Contracts')
+    days_to_expire = fields.Integer(
+        string='Days to Expire',
+        default=30,
+        help='Include contracts expiring in this many days'
+    )
+
+    state = fields.Selection([
+        ('draft', 'Draft'),
+        ('running', 'Running'),
+        ('done', 'Done'),
+        ('cancelled', 'Cancelled')
+    ], string='Status', default='draft', help='Current state of the billing run')
+
+    processed_count = fields.Integer(
+        string='Processed Contracts',
+        compute='_compute_processed_count'
+    )
+
+    invoice_ids = fields.One2many(
+        comodel_name='it.outsource.invoice',
+        inverse_name='billing_job_id',
+        string='Invoices'
+    )
+    invoice_count = fields.Integer(compute='_compute_invoice_count')
+
+    log_ids = fields.One2many(
+        comodel_name='it.outsource.billing.job.log',
+        inverse_name='job_id',
+        string='Errors'
+    )
+    error_count = fields.Integer(compute='_compute_error_count')
+
+    @api.depends('date')
+    def _compute_name(self):
+        for job in self:
+            job.name = _('Billing %s', job.date or '')
+
+    def _compute_invoice_count(self):
+        groups = self.env['it.outsource.invoice']._read_group(
+            [('billing_job_id', 'in', self.ids)], ['billing_job_id'], ['__count'])
+        counts = {job.id: count for job, count in groups}
+        for job in self:
+            job.invoice_count = counts.get(job.id, 0)
+
+    def _compute_error_count(self):
+        groups = self.env['it.outsource.billing.job.log']._read_group(
+            [('job_id', 'in', self.ids)], ['job_id'], ['__count'])
+        counts = {job.id: count for job, count in groups}
+        for job in self:
+            job.error_count = counts.get(job.id, 0)
+
+    @api.depends('invoice_count', 'error_count')
+    def _compute_processed_count(self):
+        for job in self:
+            job.processed_count = job.invoice_count + job.error_count
+
+    @api.constrains('days_to_expire')
+    def _check_days_to_expire(self):
+        """Validate the days to expire.
+        Raises:
+            ValidationError: If the days to expire is less than 1
+        """
+        for job in self:
+            if job.include_expiring and job.days_to_expire < 1:
+                raise ValidationError(_("Days to expire must be at least 1"))
+
+    def action_start(self):
+        """Queue the billing run and wake up all billing cron workers."""
+        self.write({'state': 'running'})
+        self._trigger_workers()
+
+    @api.model
+    def _trigger_workers(self):
+        for xmlid in BILLING_CRON_XMLIDS:
+            cron = self.env.ref(xmlid, raise_if_not_found=False)
+            if cron and cron.active:
+                cron._trigger()
+
+    def action_cancel(self):
+        self.filtered(lambda job: job.state != 'done').write({'state': 'cancelled'})
+
+    def action_view_invoices(self):
+        self.ensure_one()
+        return {
+            'name': _('Invoices'),
+            'type': 'ir.actions.act_window',
+            'res_model': 'it.outsource.invoice',
+            'view_mode': 'tree,form',
+            'domain': [('billing_job_id', '=', self.id)],
+            'context': {'create': False},
+        }
+
+    @api.model
+    def _cron_process_jobs(self):
+        """Process every running billing job."""
+        for job in self.search([('state', '=', 'running')], order='id'):
+            job._run()
+
+    def _get_contract_domain(self):
+        self.ensure_one()
+        return self.env['it.outsource.contract']._get_billing_domain(
+            include_active=self.include_active,
+            include_expiring=self.include_expiring,
+            days_to_expire=self.days_to_expire,
+        )
+
+    def _claim_contracts(self, domain, limit, lock=True):
+        """Select contracts of the job that are not processed yet.
+        Contracts already billed for the job period or having an error log
+        from this job are skipped. With ``lock`` the rows are locked with
+        ``FOR UPDATE SKIP LOCKED`` and marked as claimed by the job in the
+        same statement. Locks only keep concurrent workers apart until the
+        next commit: the mark makes a worker whose snapshot predates that
+        commit fail with a serialization error instead of claiming the
+        contracts again.
+        Args:
+            domain (list): Domain of the contracts to bill
+            limit (int): Maximum number of contracts to claim
+            lock (bool): Lock the claimed rows
+        Returns:
+            recordset: Claimed contracts
+        Raises:
+            SerializationFailure: If another worker billed a candidate
+                contract after the transaction started
+        """
+        self.ensure_one()
+        Contract = self.env['it.outsource.contract']
+        self.env['it.outsource.billing.job.log'].flush_model(['contract_id', 'job_id'])
+        query = Contract._get_unbilled_query(domain, date_utils.start_of(self.date, 'month'))
+        query.add_where(SQL(
+            """NOT EXISTS (SELECT 1 FROM it_outsource_billing_job_log log
+                           WHERE log.contract_id = it_outsource_contract.id
+                             AND log.job_id = %s)""",
+            self.id,
+        ))
+        query.limit = limit
+        select = query.select('"it_outsource_contract".id')
+        if lock:
+            select = SQL(
+                """UPDATE it_outsource_contract SET billing_job_id = %s
+                   WHERE id IN (%s FOR UPDATE OF it_outsource_contract SKIP LOCKED)
+               RETURNING id""",
+                self.id, select,
+            )
+        self.env.cr.execute(select)
+        contracts = Contract.browse(sorted(row[0] for row in self.env.cr.fetchall()))
+        if lock:
+            contracts.invalidate_recordset(['billing_job_id'])
+        return contracts
+
+    def _run(self, chunk_size=BILLING_CHUNK_SIZE):
+        """Bill the contracts of the job chunk by chunk.
+        Each iteration claims and locks a chunk of unbilled contracts, bills
+        it and commits, which releases the locks. Several workers can run
+        the same job concurrently without billing a contract twice; a worker
+        losing a claim to a concurrent commit stops and wakes up the billing
+        workers, which resume the job with a fresh snapshot. The job is marked done by the worker that
+        finds nothing left to bill.
+        Args:
+            chunk_size (int): Number of contracts billed per transaction
+        """
+        self.ensure_one()
+        domain = self._get_contract_domain()
+        while domain is not None:
+            try:
+                with self.env.cr.savepoint(flush=False):
+                    contracts = self._claim_contracts(domain, chunk_size)
+            except errors.SerializationFailure:
+                # another worker billed part of the chunk since this
+                # transaction started; resume at once with a fresh snapshot
+                # rather than at the next scheduled run
+                _logger.info("Billing job %s: concurrent claim, stopping this run", self.id)
+                self._trigger_workers()
+                return
+            if not contracts:
+                break
+            self._bill_contracts(contracts)
+            self._commit_progress()
+
+        if domain is None or not self._claim_contracts(domain, 1, lock=False):
+            self._mark_done()
+        self._commit_progress()
+
+    def _mark_done(self):
+        """Mark the job done unless another worker is already finishing it."""
+        self.env.cr.execute(
+            "SELECT id FROM it_outsource_billing_job WHERE id = %s AND state = 'running' "
+            "FOR NO KEY UPDATE SKIP LOCKED", [self.id])
+        if self.env.cr.fetchone():
+            self.write({'state': 'done'})
+
+    def _bill_contracts(self, contracts):
+        """Create the invoices of one chunk of contracts.
+        The chunk is billed in one batch. When the batch fails, contracts are
+        billed one by one in their own savepoint and failures are logged on
+        the job instead of aborting the transaction.
+        Args:
+            contracts (recordset): Contracts to bill
+        """
+        extra_vals = {'billing_job_id': self.id}
+        try:
+            with self.env.cr.savepoint():
+                contracts._create_invoices(self.date, extra_vals=extra_vals)
+            return
+        except Exception:
+            _logger.info("Billing job %s: batch failed, billing contracts one by one", self.id)
+
+        logs = []
+        for contract in contracts:
+            try:
+                with self.env.cr.savepoint():
+                    contract._create_invoices(self.date, extra_vals=extra_vals)
+            except Exception as e:
+                logs.append({
+                    'job_id': self.id,
+                    'contract_id': contract.id,
+                    'message': str(e),
+                })
+        self.env['it.outsource.billing.job.log'].create(logs)
+
+    def _commit_progress(self):
+        if not getattr(threading.current_thread(), 'testing', False):
+            self.env.cr.commit()
+
+
+class BillingJobLog(models.Model):
+    """Billing job log model for IT outsourcing.
+    This class records a contract that could not be billed by a billing job.
+    """
+    _name = 'it.outsource.billing.job.log'
+    _description = 'Billing Job Error'
+    _order = 'id'
+
+    job_id = fields.Many2one(
+        comodel_name='it.outsource.billing.job',
+        string='Billing Job',
+        required=True,
+        index=True,
+        ondelete='cascade'
+    )
+    contract_id = fields.Many2one(
+        comodel_name='it.outsource.contract',
+        string='Contract',
+        ondelete='cascade'
+    )
+    message = fields.Text(help='Error raised while billing the contract')
@@ -1,5 +1,9 @@
+from datetime import timedelta
 from odoo import models, fields, api, _
 from odoo.exceptions import ValidationError
+from odoo.tools import SQL, date_utils, format_date, split_every
+
+INVOICE_BATCH_SIZE = 1000
 
 
 class Contract(models.Model):
@@ -28,6 +32,7 @@ class Contract(models.Model):
         comodel_name='res.partner',
         string='Client',
         required=True,
+        index=True,
         tracking=True,
         help='The client who signed the contract'
     )
@@ -46,6 +51,7 @@ class Contract(models.Model):
 
     end_date = fields.Date(
         required=True,
+        index=True,
         tracking=True,
         help='Date when the contract ends'
     )
@@ -62,13 +68,15 @@ class Contract(models.Model):
         ('active', 'Active'),
         ('expired', 'Expired'),
         ('cancelled', 'Cancelled')
-    ], string='Status', default='draft', tracking=True, help='Current state of the contract')
+    ], string='Status', default='draft', index=True, tracking=True,
+        help='Current state of the contract')
 
     notes = fields.Text(
         help='Additional information about the contract'
     )
 
     monthly_total = fields.Float(
+        compute='_compute_monthly_total',
         store=True,
         help='Total monthly cost of all products'
     )
@@ -78,6 +86,28 @@ class Contract(models.Model):
         help='Reason for canceling the contract'
     )
 
+    auto_renew = fields.Boolean(
+        tracking=True,
+        help='Renew the contract for the same duration when it ends'
+    )
+
+    renewed_from_id = fields.Many2one(
+        comodel_name='it.outsource.contract',
+        string='Renewal Of',
+        readonly=True,
+        copy=False,
+        index='btree_not_null',
+        help='Contract this contract was renewed from'
+    )
+
+    billing_job_id = fields.Many2one(
+        comodel_name='it.outsource.billing.job',
+        string='Last Billing Job',
+        readonly=True,
+        copy=False,
+        help='Billing run that last claimed the contract'
+    )
+
     invoice_ids = fields.One2many(
         comodel_name='it.outsource.invoice',
         inverse_name='contract_id',
@@ -90,6 +120,19 @@ class Contract(models.Model):
         string='Service Reports'
     )
 
+    def init(self):
+        # Keyset pagination of the sync API
+        self.env.cr.execute("""
+            CREATE INDEX IF NOT EXISTS it_outsource_contract_write_date_id_idx
+                ON it_outsource_contract (write_date, id)
+        """)
+        # Expiring contracts of the billing wizard and the expiry cron
+        self.env.cr.execute("""
+            CREATE INDEX IF NOT EXISTS it_outsource_contract_active_end_date_idx
+                ON it_outsource_contract (end_date, id)
+             WHERE state = 'active'
+        """)
+
     @api.depends('number', 'partner_id.name')
     def _compute_name(self):
         for record in self:
@@ -97,6 +140,15 @@ class Contract(models.Model):
             client_part = record.partner_id.name or ''
             record.name = f"{number_part} / {client_part}"
 
+    @api.depends('product_ids.price')
+    def _compute_monthly_total(self):
+        """Compute the monthly total of the contract.
+        This method sums up the prices of all contract products. The field
+        is stored and recomputed whenever a product or its price changes.
+        """
+        for contract in self:
+            contract.monthly_total = sum(contract.product_ids.mapped('price'))
+
     @api.model_create_multi
     def create(self, vals_list):
         """Create new contracts with sequence numbers.
@@ -107,11 +159,213 @@ class Contract(models.Model):
         Returns:
             recordset: Newly created contracts
         """
-        for vals in vals_list:
-            if vals.get('name', 'New') == 'New':
-                vals['name'] = self.env['ir.sequence'].next_by_code('it_outsource.contract') or 'New'
+        to_number = [vals for vals in vals_list if vals.get('number', 'New') == 'New']
+        numbers = self.env['ir.sequence'].next_many_by_code('it_outsource.contract', len(to_number))
+        for vals, number in zip(to_number, numbers):
+            vals['number'] = number or 'New'
         return super().create(vals_list)
 
+    @api.model
+    def _get_billing_domain(self, include_active=True, include_expiring=False, days_to_expire=30):
+        """Build the domain of contracts to bill.
+        All active contracts are billed when ``include_active`` is set,
+        otherwise only the active ones expiring within ``days_to_expire``.
+        Args:
+            include_active (bool): Include all active contracts
+            include_expiring (bool): Include contracts expiring soon
+            days_to_expire (int): Expiration horizon in days
+        Returns:
+            list: Search domain, or None when nothing has to be billed
+        """
+        domain = [('state', '=', 'active')]
+        if include_active:
+            return domain
+        if include_expiring:
+            expiration_date = fields.Date.context_today(self) + timedelta(days=days_to_expire)
+            return domain + [('end_date', '<=', expiration_date)]
+        return None
+
+    @api.model
+    def _get_unbilled_query(self, domain, period_start):
+        """Build the query of contracts without an invoice for a period.
+        Contracts not running within the period are left out, and already
+        billed contracts are excluded with an anti-join on the (contract,
+        period) index of invoices, so no invoice is loaded. The query is
+        built by _search(), so record rules apply.
+        Args:
+            domain (list): Domain of the contracts to bill
+            period_start (date): First day of the billing period
+        Returns:
+            Query: Query selecting the unbilled contracts
+        """
+        self.env['it.outsource.invoice'].flush_model(['contract_id', 'period_start', 'state'])
+        period_end = date_utils.end_of(period_start, 'month')
+        query = self._search(domain + [
+            ('start_date', '<=', period_end),
+            ('end_date', '>=', period_start),
+        ], order='id')
+        query.add_where(SQL(
+            """NOT EXISTS (SELECT 1 FROM it_outsource_invoice inv
+                           WHERE inv.contract_id = it_outsource_contract.id
+                             AND inv.period_start = %s
+                             AND inv.state != 'cancelled')""",
+            period_start,
+        ))
+        return query
+
+    @api.model
+    def _search_unbilled(self, domain, period_start):
+        """Search contracts matching ``domain`` not billed for a period.
+        Args:
+            domain (list): Domain of the contracts to bill
+            period_start (date): First day of the billing period
+        Returns:
+            recordset: Unbilled contracts
+        """
+        return self.browse(self._get_unbilled_query(domain, period_start))
+
+    def _get_proration(self, period_start, period_end):
+        """Compute the billed fraction of a period for the contracts.
+        The dates of all contracts are read in one pass, and the fraction of
+        each contract is the number of days it runs within the period over
+        the number of days of the period. Contracts not running within the
+        period get a fraction of 0.
+        Args:
+            period_start (date): First day of the billing period
+            period_end (date): Last day of the billing period
+        Returns:
+            dict: Contract id -> (fraction, note) for the prorated contracts
+        """
+        period_days = (period_end - period_start).days + 1
+        proration = {}
+        self.fetch(['start_date', 'end_date'])
+        for contract in self:
+            start, end = contract.start_date, contract.end_date
+            first = max(start, period_start) if start else period_start
+            last = min(end, period_end) if end else period_end
+            days = max((last - first).days + 1, 0)
+            if days == period_days:
+                continue
+            reasons = []
+            if start and start > period_start:
+                reasons.append(_('starts on %s', format_date(self.env, start)))
+            if end and end < period_end:
+                reasons.append(_('ends on %s', format_date(self.env, end)))
+            proration[contract.id] = (days / period_days, _(
+                '%(days)s of %(period_days)s days billed, contract %(reasons)s',
+                days=days, period_days=period_days, reasons=_(' and ').join(reasons)))
+        return proration
+
+    def _prepare_invoice_vals(self, invoice_date, usage=None, proration=None):
+        """Prepare the values of an invoice billing the contract products.
+        Fixed-price products are billed once for the period, or for the
+        prorated fraction of it. Usage-billed products are billed for the
+        quantity used in the period, including products recorded as used
+        but no longer on the contract.
+        Args:
+            invoice_date (date): Date of the invoice
+            usage (dict): Product -> quantity used in the period
+            proration (tuple): (fraction, note) when the period is prorated
+        Returns:
+            dict: Values for creating an it.outsource.invoice record
+        """
+        self.ensure_one()
+        usage = usage or {}
+        fraction, note = proration or (1, False)
+        quantities = {
+            product: usage.get(product, 0.0) if product.billing_method == 'usage' else fraction
+            for product in self.product_ids
+        }
+        for product, quantity in usage.items():
+            quantities.setdefault(product, quantity)
+        return {
+            'contract_id': self.id,
+            'date': invoice_date,
+            'period_start': date_utils.start_of(invoice_date, 'month'),
+            'proration_note': note,
+            'line_ids': [(0, 0, {
+                'product_type': product.product_type,
+                'product_id': product.id,
+                'quantity': quantity,
+                'price_unit': product.price,
+                'description': product.name,
+            }) for product, quantity in quantities.items()],
+        }
+
+    def _prepare_invoice_vals_list(self, invoice_date):
+        """Prepare the invoice values of all contracts.
+        Contracts and their products are fetched in one pass, the usage of
+        the billed month is summed per contract and product with one grouped
+        query and contracts not covering the whole month are prorated.
+        Contracts not running within the billed month are skipped.
+        Args:
+            invoice_date (date): Date of the invoices
+        Returns:
+            list: Invoice values, in the order of the contracts
+        """
+        self.fetch(['product_ids'])
+        self.product_ids.fetch(['name', 'product_type', 'price', 'billing_method'])
+        period_start = date_utils.start_of(invoice_date, 'month')
+        period_end = date_utils.end_of(invoice_date, 'month')
+        usage = self.env['it.outsource.usage.record']._get_period_usage(
+            self.ids, period_start, period_end)
+        proration = self._get_proration(period_start, period_end)
+        return [
+            contract._prepare_invoice_vals(
+                invoice_date, usage.get(contract.id), proration.get(contract.id))
+            for contract in self
+            if proration.get(contract.id, (1, False))[0]
+        ]
+
+    def _create_invoices(self, invoice_date, batch_size=INVOICE_BATCH_SIZE, extra_vals=None):
+        """Create one invoice per contract using batched inserts.
+        All invoice values are prepared up front and the invoices with their
+        lines are created ``batch_size`` records per create() call.
+        Args:
+            invoice_date (date): Date of the invoices
+            batch_size (int): Number of invoices per create() call
+            extra_vals (dict): Values added to every invoice
+        Returns:
+            list: Ids of the created invoices
+        """
+        vals_list = self._prepare_invoice_vals_list(invoice_date)
+        if extra_vals:
+            for vals in vals_list:
+                vals.update(extra_vals)
+
+        Invoice = self.env['it.outsource.invoice']
+        invoice_ids = []
+        for batch in split_every(batch_size, vals_list, list):
+            invoice_ids.extend(Invoice.create(batch).ids)
+        return invoice_ids
+
+    def _allocate_servers(self, cpu_count=0, ram_gb=0.0, disk_space_gb=0.0, count=1):
+        """Allocate available servers to the contract.
+        Args:
+            cpu_count (int): Minimum number of CPUs per server
+            ram_gb (float): Minimum RAM per server
+            disk_space_gb (float): Minimum disk space per server
+            count (int): Number of servers to allocate
+        Returns:
+            recordset: Allocated servers
+        """
+        self.ensure_one()
+        servers = self.env['it.outsource.product']._allocate_servers(
+            cpu_count=cpu_count, ram_gb=ram_gb, disk_space_gb=disk_space_gb, count=count)
+        self.write({'product_ids': [(4, server_id) for server_id in servers.ids]})
+        return servers
+
+    def action_allocate_servers(self):
+        self.ensure_one()
+        return {
+            'name': _('Allocate Servers'),
+            'type': 'ir.actions.act_window',
+            'res_model': 'it.outsource.server.allocation.wizard',
+            'view_mode': 'form',
+            'target': 'new',
+            'context': {'default_contract_id': self.id},
+        }
+
     def action_draft(self):
         self.write({'state': 'draft'})
 
@@ -130,6 +384,59 @@ class Contract(models.Model):
     def action_expire(self):
         self.write({'state': 'expired'})
 
+    @api.model
+    def _cron_expire_contracts(self, batch_size=INVOICE_BATCH_SIZE):
+        """Expire active contracts whose end date has passed.
+        Contracts flagged for auto-renewal get an active successor first.
+        All ended contracts are then expired with one write, without
+        per-record chatter, and the servers no longer used by an active
+        contract are released with one write.
+        Args:
+            batch_size (int): Number of successors per create() call
+        """
+        today = fields.Date.context_today(self)
+        ended = self.search([('state', '=', 'active'), ('end_date', '<', today)])
+        if not ended:
+            return
+        ended = ended.with_context(tracking_disable=True)
+        ended.filtered('auto_renew')._create_renewals(today, batch_size)
+        ended.write({'state': 'expired'})
+
+        servers = ended.product_ids.filtered(
+            lambda product: product.product_type == 'server' and product.state == 'rented')
+        still_used = self.search([
+            ('state', '=', 'active'),
+            ('product_ids', 'in', servers.ids),
+        ]).product_ids
+        (servers - still_used).action_return()
+
+    def _create_renewals(self, today, batch_size=INVOICE_BATCH_SIZE):
+        """Create active successors of the contracts for the same duration.
+        Args:
+            today (date): Earliest start date of the successors
+            batch_size (int): Number of successors per create() call
+        Returns:
+            recordset: Created contracts
+        """
+        vals_list = []
+        for contract in self:
+            start_date = max(contract.end_date + timedelta(days=1), today)
+            vals_list.append({
+                'partner_id': contract.partner_id.id,
+                'number': contract.number,
+                'start_date': start_date,
+                'end_date': start_date + (contract.end_date - contract.start_date),
+                'product_ids': [(6, 0, contract.product_ids.ids)],
+                'notes': contract.notes,
+                'auto_renew': True,
+                'renewed_from_id': contract.id,
+                'state': 'active',
+            })
+        renewal_ids = []
+        for batch in split_every(batch_size, vals_list, list):
+            renewal_ids.extend(self.create(batch).ids)
+        return self.browse(renewal_ids)
+
     def action_cancel(self):
         """Cancel the contract.
         This method changes the state of the contract to 'cancelled'.
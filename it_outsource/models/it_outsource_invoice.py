@@ -1,6 +1,14 @@
 from datetime import timedelta
 from odoo import models, fields, api, _
 from odoo.exceptions import ValidationError
+from odoo.tools import SQL, split_every
+
+MAIL_BATCH_SIZE = 500
+ACCOUNTING_BATCH_SIZE = 500
+# Mails handed to the mail queue per minute, 0 to send as fast as possible
+DEFAULT_MAIL_RATE = 200
+# Next free send slot of the invoice mail schedule, shared by all senders
+MAIL_SLOT_PARAM = 'it_outsource.invoice_mail_next_slot'
 
 
 class Invoice(models.Model):
@@ -11,8 +19,9 @@ class Invoice(models.Model):
     """
     _name = 'it.outsource.invoice'
     _description = 'Rental Invoice'
-    _inherit = ['mail.thread', 'mail.activity.mixin']
+    _inherit = ['mail.thread', 'mail.activity.mixin', 'it.outsource.report.mixin']
     _order = 'date desc'
+    _pdf_report_xmlid = 'it_outsource.action_report_server_rental_invoice_pdf'
 
     name = fields.Char(
         string='Invoice Number',
@@ -26,20 +35,31 @@ class Invoice(models.Model):
         comodel_name='it.outsource.contract',
         string='Contract',
         required=True,
+        index=True,
         ondelete='restrict',
         help='The contract under which services were provided'
     )
+    partner_id = fields.Many2one(
+        comodel_name='res.partner',
+        string='Client',
+        related='contract_id.partner_id',
+        store=True,
+        index=True,
+        help='The client billed by the invoice'
+    )
 
     date = fields.Date(
         string='Invoice Date',
         default=fields.Date.context_today,
         required=True,
+        index=True,
         tracking=True,
         help='Date when the invoice was created'
     )
     due_date = fields.Date(
         compute='_compute_due_date',
         store=True,
+        index=True,
         readonly=False,
         help='Date when the invoice payment is due'
     )
@@ -56,6 +76,7 @@ class Invoice(models.Model):
         ('cancelled', 'Cancelled')
     ], string='Status',
         default='draft',
+        index=True,
         tracking=True,
         group_expand='_expand_states',
         help='Current state of the invoice'
@@ -69,12 +90,14 @@ class Invoice(models.Model):
     )
     paid_amount = fields.Monetary(
         compute='_compute_paid_amount',
+        store=True,
         currency_field='currency_id',
         help='Total amount that has been paid'
     )
     residual = fields.Monetary(
         string='Balance Due',
         compute='_compute_residual',
+        store=True,
         currency_field='currency_id',
         help='Remaining amount to be paid'
     )
@@ -91,6 +114,56 @@ class Invoice(models.Model):
         copy=True,
         help='List of items being invoiced'
     )
+    period_start = fields.Date(
+        string='Billing Period',
+        copy=False,
+        help='First day of the month billed by the invoice'
+    )
+    proration_note = fields.Char(
+        string='Proration',
+        copy=False,
+        readonly=True,
+        help='Why fixed prices were prorated, when the contract does not '
+             'cover the whole billing period'
+    )
+    billing_job_id = fields.Many2one(
+        comodel_name='it.outsource.billing.job',
+        string='Billing Job',
+        readonly=True,
+        copy=False,
+        index='btree_not_null',
+        help='Billing run that generated the invoice'
+    )
+    account_move_ids = fields.One2many(
+        comodel_name='account.move',
+        inverse_name='it_outsource_invoice_id',
+        string='Journal Entries',
+        readonly=True,
+        help='Customer invoice posted in accounting for this invoice'
+    )
+
+    def init(self):
+        # A contract is billed at most once per period; cancelled invoices
+        # and invoices created by hand without a period are not constrained.
+        self.env.cr.execute("""
+            CREATE UNIQUE INDEX IF NOT EXISTS it_outsource_invoice_contract_period_uniq
+                ON it_outsource_invoice (contract_id, period_start)
+             WHERE period_start IS NOT NULL AND state != 'cancelled'
+        """)
+        # Keyset pagination of the sync API
+        self.env.cr.execute("""
+            CREATE INDEX IF NOT EXISTS it_outsource_invoice_write_date_id_idx
+                ON it_outsource_invoice (write_date, id)
+        """)
+        # Only open invoices are indexed, so open invoice searches stay fast
+        # however many paid invoices accumulate. Serves the overdue amounts
+        # of clients (partner, due date), the open invoices loaded by the
+        # statement matching (by partner or all) and the "Unpaid" filter.
+        self.env.cr.execute("""
+            CREATE INDEX IF NOT EXISTS it_outsource_invoice_open_due_date_idx
+                ON it_outsource_invoice (partner_id, due_date, id)
+             WHERE state IN ('draft', 'sent') AND residual > 0
+        """)
 
     def _expand_states(self, states, domain, order):
         return [key for key, val in type(self).state.selection]
@@ -113,16 +186,20 @@ class Invoice(models.Model):
             if invoice.date:
                 invoice.due_date = invoice.date + timedelta(days=30)
 
-    @api.depends('payment_ids.amount')
+    @api.depends('payment_ids.amount', 'payment_ids.state')
     def _compute_paid_amount(self):
         """Compute the total paid amount.
         This method calculates the total amount that has been paid by summing
-        up all confirmed payments.
+        up all confirmed payments. The field is stored and recomputed only
+        for invoices whose payments are created, changed or deleted, with one
+        grouped query for the whole batch.
         """
+        groups = self.env['it.outsource.payment']._read_group(
+            [('invoice_id', 'in', self.ids), ('state', '=', 'confirmed')],
+            ['invoice_id'], ['amount:sum'])
+        paid = {invoice.id: amount for invoice, amount in groups}
         for invoice in self:
-            invoice.paid_amount = sum(invoice.payment_ids.mapped('amount'))
-            # if invoice.paid_amount >= invoice.amount:
-            #     invoice.state = 'paid'
+            invoice.paid_amount = paid.get(invoice._origin.id, 0.0)
 
     @api.depends('amount', 'paid_amount')
     def _compute_residual(self):
@@ -133,20 +210,23 @@ class Invoice(models.Model):
         for invoice in self:
             invoice.residual = invoice.amount - invoice.paid_amount
 
-    @api.model
-    def create(self, vals):
-        """Create a new invoice with a sequence number.
+    @api.model_create_multi
+    def create(self, vals_list):
+        """Create new invoices with sequence numbers.
         This method overrides the create method to automatically generate
-        sequence numbers for new invoices.
+        sequence numbers for new invoices. The numbers of the whole batch
+        are reserved from the sequence in one call.
         Args:
-            vals (dict): Dictionary containing values for the new record
+            vals_list (list): List of dictionaries containing values for new records
         Returns:
-            record: Newly created invoice
+            recordset: Newly created invoices
         """
-        if vals.get('name', 'New') == 'New':
-            vals['name'] = self.env['ir.sequence'].next_by_code(
-                'it.outsource.invoice') or 'New'
-        return super().create(vals)
+        to_number = [vals for vals in vals_list if vals.get('name', 'New') == 'New']
+        names = self.env['ir.sequence'].next_many_by_code(
+            'it.outsource.invoice', len(to_number))
+        for vals, name in zip(to_number, names):
+            vals['name'] = name or 'New'
+        return super().create(vals_list)
 
     def _get_report_base_filename(self):
         """
@@ -154,24 +234,180 @@ class Invoice(models.Model):
         """
         return f'Invoice_{self.name}_{self.date}'
 
-    def action_send(self):
-        """Send the invoice.
-        This method changes the state of the invoice to 'sent'.
-        It also validates that the invoice has at least one line.
-        Raises:
-            ValidationError: If the invoice has no lines
+    @api.model
+    def _search_unposted(self):
+        """Search sent and paid invoices without a journal entry.
+        Returns:
+            recordset: Invoices to post in accounting
+        """
+        self.env['account.move'].flush_model(['it_outsource_invoice_id'])
+        query = self._search([('state', 'in', ('sent', 'paid'))], order='id')
+        query.add_where(SQL(
+            """NOT EXISTS (SELECT 1 FROM account_move move
+                           WHERE move.it_outsource_invoice_id = it_outsource_invoice.id)"""))
+        return self.browse(query)
+
+    def _prepare_account_move_vals(self, journal):
+        """Prepare the customer invoice posting the rental invoice.
+        Args:
+            journal (account.journal): Sales journal
+        Returns:
+            dict: Values for creating an account.move record
         """
         self.ensure_one()
+        return {
+            'move_type': 'out_invoice',
+            'journal_id': journal.id,
+            'partner_id': self.partner_id.id,
+            'currency_id': self.currency_id.id,
+            'invoice_date': self.date,
+            'invoice_date_due': self.due_date,
+            'ref': self.name,
+            'it_outsource_invoice_id': self.id,
+            'invoice_line_ids': [(0, 0, {
+                'name': line.description or line.product_id.name or self.name,
+                'quantity': line.quantity,
+                'price_unit': line.price_unit,
+                'account_id': (line.product_id.income_account_id or journal.default_account_id).id,
+                'tax_ids': [(6, 0, [])],
+            }) for line in self.line_ids],
+        }
+
+    def _post_to_accounting(self, batch_size=ACCOUNTING_BATCH_SIZE):
+        """Post the invoices as customer invoices in accounting.
+        The invoices and their lines are read chunk by chunk, and each chunk
+        of journal entries is created with one create() call and posted in
+        one batch. Entries keep a link to their rental invoice.
+        Args:
+            batch_size (int): Number of invoices per create() call
+        Raises:
+            ValidationError: If the company has no sales journal
+        Returns:
+            recordset: Posted journal entries
+        """
+        if not self:
+            return self.env['account.move']
+        journal = self.env['account.journal'].search([
+            ('type', '=', 'sale'),
+            ('company_id', '=', self.env.company.id),
+        ], limit=1)
+        if not journal:
+            raise ValidationError(_('Define a sales journal to post rental invoices.'))
+        AccountMove = self.env['account.move']
+        move_ids = []
+        for invoices in split_every(batch_size, self.ids, self.browse):
+            invoices.fetch(['name', 'partner_id', 'currency_id', 'date', 'due_date', 'line_ids'])
+            invoices.line_ids.fetch(['product_id', 'description', 'quantity', 'price_unit'])
+            invoices.line_ids.product_id.fetch(['name', 'income_account_id'])
+            moves = AccountMove.create([invoice._prepare_account_move_vals(journal)
+                                        for invoice in invoices])
+            moves.action_post()
+            move_ids.extend(moves.ids)
+        return AccountMove.browse(move_ids)
+
+    @api.model
+    def _cron_post_to_accounting(self):
+        """Post the pending rental invoices, then the pending payments."""
+        self._search_unposted()._post_to_accounting()
+        Payment = self.env['it.outsource.payment']
+        Payment._search_unposted()._post_to_accounting()
 
-        template = self.env.ref(
-            'your_module_name.email_template_rental_invoice',
-            raise_if_not_found=False)
-        if template:
-            template.send_mail(self.id, force_send=True)
+    def _get_report_hash_values(self):
+        self.ensure_one()
+        return (
+            self.name, self.date, self.due_date, self.contract_id.name,
+            self.contract_id.partner_id.name, self.currency_id.name,
+            self.amount, self.paid_amount, self.residual,
+            tuple((line.product_id.name, line.description, line.quantity,
+                   line.price_unit, line.amount) for line in self.line_ids),
+        )
 
-        self.write({'state': 'sent'})
+    def action_send(self):
+        """Send the invoices.
+        The invoice e-mails are queued and delivered by the mail queue
+        cron, and the invoices are marked as sent.
+        Returns:
+            bool: True
+        """
+        self._send_mails()
+        self.with_context(tracking_disable=len(self) > 1).write({'state': 'sent'})
         return True
 
+    def _send_mails(self, batch_size=MAIL_BATCH_SIZE):
+        """Queue the invoice e-mails, throttled to the configured rate.
+        The template is rendered for ``batch_size`` invoices at a time and
+        the mails are queued without being sent. With a rate configured by
+        the ``it_outsource.invoice_mail_rate`` parameter (mails per minute),
+        mails are spread over the slots reserved in the shared schedule, so
+        concurrent sends together keep to the rate, and the mail queue cron
+        is triggered for each minute.
+        Args:
+            batch_size (int): Number of invoices rendered at once
+        Returns:
+            recordset: Queued mail.mail records
+        """
+        template = self.env.ref('it_outsource.email_template_rental_invoice',
+                                raise_if_not_found=False)
+        if not template or not self:
+            return self.env['mail.mail']
+        mails = self.env['mail.mail']
+        for ids in split_every(batch_size, self.ids, list):
+            mails |= template.send_mail_batch(ids, force_send=False)
+
+        rate = int(self.env['ir.config_parameter'].sudo().get_param(
+            'it_outsource.invoice_mail_rate', DEFAULT_MAIL_RATE))
+        if rate > 0 and mails:
+            start = self._reserve_mail_slots(len(mails), rate)
+            schedule = [
+                (mail_id, start + timedelta(seconds=index * 60 // rate))
+                for index, mail_id in enumerate(mails.ids)
+            ]
+            mails.flush_recordset(['scheduled_date'])
+            self.env.cr.execute(SQL(
+                """UPDATE mail_mail SET scheduled_date = slot.scheduled_date
+                     FROM (VALUES %s) AS slot (id, scheduled_date)
+                    WHERE mail_mail.id = slot.id""",
+                SQL(', ').join(SQL('(%s, %s::timestamp)', *slot) for slot in schedule),
+            ))
+            mails.invalidate_recordset(['scheduled_date'])
+            send_times = [start + timedelta(minutes=index // rate)
+                          for index in range(0, len(mails), rate)]
+            cron = self.env.ref('mail.ir_cron_mail_scheduler_action', raise_if_not_found=False)
+            if cron:
+                cron.sudo()._trigger(at=send_times)
+        return mails
+
+    @api.model
+    def _reserve_mail_slots(self, count, rate):
+        """Reserve consecutive slots of the shared invoice mail schedule.
+        The next free slot is kept in a system parameter whose row is locked
+        while it is moved, so concurrent senders reserve disjoint slots. The
+        row is created first if it is missing, so there is always a row to
+        lock, and it is moved with a direct UPDATE rather than set_param(),
+        which would clear the caches of all workers on every send.
+        Args:
+            count (int): Number of mails to schedule
+            rate (int): Mails sent per minute
+        Returns:
+            datetime: First reserved slot
+        """
+        now = fields.Datetime.now()
+        self.env.cr.execute(SQL(
+            """INSERT INTO ir_config_parameter (key, value, create_uid, create_date, write_uid, write_date)
+               VALUES (%(key)s, %(now)s, %(uid)s, %(now)s, %(uid)s, %(now)s)
+               ON CONFLICT (key) DO NOTHING""",
+            key=MAIL_SLOT_PARAM, now=now, uid=self.env.uid,
+        ))
+        self.env.cr.execute(SQL(
+            "SELECT value FROM ir_config_parameter WHERE key = %s FOR UPDATE", MAIL_SLOT_PARAM))
+        start = max(now, fields.Datetime.to_datetime(self.env.cr.fetchone()[0]))
+        self.env.cr.execute(SQL(
+            "UPDATE ir_config_parameter SET value = %s, write_uid = %s, write_date = %s WHERE key = %s",
+            fields.Datetime.to_string(start + timedelta(minutes=count / rate)),
+            self.env.uid, now, MAIL_SLOT_PARAM,
+        ))
+        return start
+
     def action_paid(self):
         """Mark the invoice as paid.
         This method marks the invoice as paid if the residual amount is 0 or less.
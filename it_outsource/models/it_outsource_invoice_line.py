@@ -14,6 +14,7 @@ class InvoiceLine(models.Model):
         comodel_name='it.outsource.invoice',
         string='Invoice',
         required=True,
+        index=True,
         ondelete='cascade')
 
     product_type = fields.Selection([
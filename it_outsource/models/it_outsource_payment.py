@@ -1,5 +1,14 @@
+from collections import defaultdict
+
 from odoo import models, fields, api, _
 from odoo.exceptions import ValidationError
+from odoo.tools import SQL, split_every
+
+ACCOUNTING_BATCH_SIZE = 500
+
+
+def _journal_type(payment_method):
+    return 'cash' if payment_method == 'cash' else 'bank'
 
 
 class Payment(models.Model):
@@ -24,6 +33,7 @@ class Payment(models.Model):
         comodel_name='it.outsource.invoice',
         string='Invoice',
         required=True,
+        index=True,
         tracking=True,
         help='The invoice this payment is for'
     )
@@ -33,6 +43,7 @@ class Payment(models.Model):
         string='Client',
         related='invoice_id.contract_id.partner_id',
         store=True,
+        index=True,
         help='The client who made the payment'
     )
 
@@ -77,6 +88,36 @@ class Payment(models.Model):
         help='Reason for canceling the payment'
     )
 
+    statement_line_id = fields.Many2one(
+        comodel_name='it.outsource.bank.statement.line',
+        string='Statement Line',
+        readonly=True,
+        copy=False,
+        index='btree_not_null',
+        help='Bank statement line this payment was matched from'
+    )
+
+    account_payment_ids = fields.One2many(
+        comodel_name='account.payment',
+        inverse_name='it_outsource_payment_id',
+        string='Accounting Payments',
+        readonly=True,
+        help='Payment posted in accounting for this payment'
+    )
+
+    def init(self):
+        # Keyset pagination of the sync API
+        self.env.cr.execute("""
+            CREATE INDEX IF NOT EXISTS it_outsource_payment_write_date_id_idx
+                ON it_outsource_payment (write_date, id)
+        """)
+        # Paid amount of invoices, summed over confirmed payments only
+        self.env.cr.execute("""
+            CREATE INDEX IF NOT EXISTS it_outsource_payment_confirmed_invoice_idx
+                ON it_outsource_payment (invoice_id, amount)
+             WHERE state = 'confirmed'
+        """)
+
     @api.model_create_multi
     def create(self, vals_list):
         """Create new payments with sequence numbers.
@@ -87,33 +128,122 @@ class Payment(models.Model):
         Returns:
             recordset: Newly created payments
         """
-        for vals in vals_list:
-            if vals.get('name', 'New') == 'New':
-                vals['name'] = self.env['ir.sequence'].next_by_code('it_outsource.payment') or 'New'
+        to_number = [vals for vals in vals_list if vals.get('name', 'New') == 'New']
+        names = self.env['ir.sequence'].next_many_by_code('it_outsource.payment', len(to_number))
+        for vals, name in zip(to_number, names):
+            vals['name'] = name or 'New'
         return super().create(vals_list)
 
-    def action_confirm(self):
-        """Confirm the payment.
-        Validates payment amount and updates invoice status if fully paid.
+    @api.model
+    def _search_unposted(self):
+        """Search confirmed payments without an accounting payment.
+        Payments wait until their invoice is posted in accounting, so they
+        are always reconciled with it when they are posted.
+        Returns:
+            recordset: Payments to post in accounting
         """
-        for payment in self:
-            if payment.amount > payment.invoice_id.residual:
-                raise ValidationError(_('Payment amount cannot exceed invoice amount.'))
+        self.env['account.payment'].flush_model(['it_outsource_payment_id'])
+        self.env['account.move'].flush_model(['it_outsource_invoice_id', 'state'])
+        query = self._search([('state', '=', 'confirmed')], order='id')
+        query.add_where(SQL(
+            """NOT EXISTS (SELECT 1 FROM account_payment pay
+                           WHERE pay.it_outsource_payment_id = it_outsource_payment.id)"""))
+        query.add_where(SQL(
+            """EXISTS (SELECT 1 FROM account_move move
+                       WHERE move.it_outsource_invoice_id = it_outsource_payment.invoice_id
+                         AND move.state = 'posted')"""))
+        return self.browse(query)
+
+    def _post_to_accounting(self, batch_size=ACCOUNTING_BATCH_SIZE):
+        """Post the payments as customer payments in accounting.
+        Each chunk of payments is created with one create() call and posted
+        in one batch, then reconciled with the receivable of the customer
+        invoice of their rental invoice when it is posted. Cash payments go
+        to the cash journal, the others to the bank journal; only the
+        journals the payments use are required.
+        Args:
+            batch_size (int): Number of payments per create() call
+        Raises:
+            ValidationError: If the company has no journal of a type the
+                payments need
+        Returns:
+            recordset: Posted accounting payments
+        """
+        if not self:
+            return self.env['account.payment']
+        journals = {}
+        for journal_type in {_journal_type(method) for method in self.mapped('payment_method')}:
+            journals[journal_type] = self.env['account.journal'].search([
+                ('type', '=', journal_type),
+                ('company_id', '=', self.env.company.id),
+            ], limit=1)
+            if not journals[journal_type]:
+                raise ValidationError(_('Define a %s journal to post rental payments.', journal_type))
 
-            payment.state = 'confirmed'
+        AccountPayment = self.env['account.payment']
+        payment_ids = []
+        for payments in split_every(batch_size, self.ids, self.browse):
+            payments.fetch(['name', 'invoice_id', 'partner_id', 'amount', 'date', 'payment_method'])
+            payments.invoice_id.fetch(['currency_id', 'account_move_ids'])
+            account_payments = AccountPayment.create([{
+                'payment_type': 'inbound',
+                'partner_type': 'customer',
+                'partner_id': payment.partner_id.id,
+                'amount': payment.amount,
+                'currency_id': payment.invoice_id.currency_id.id,
+                'date': payment.date,
+                'journal_id': journals[_journal_type(payment.payment_method)].id,
+                'ref': payment.name,
+                'it_outsource_payment_id': payment.id,
+            } for payment in payments])
+            account_payments.action_post()
+            payments._reconcile_account_payments(account_payments)
+            payment_ids.extend(account_payments.ids)
+        return AccountPayment.browse(payment_ids)
 
-            # recompute via stored field triggers
-            payment.invoice_id._compute_paid_amount()
-            payment.invoice_id._compute_residual()
+    def _reconcile_account_payments(self, account_payments):
+        """Reconcile accounting payments with their posted customer invoice.
+        All pairs are reconciled in one reconciliation plan.
+        Args:
+            account_payments (account.payment): Payments posted for ``self``
+        """
+        plan = []
+        for account_payment in account_payments:
+            moves = account_payment.it_outsource_payment_id.invoice_id.account_move_ids
+            lines = (account_payment.move_id.line_ids | moves.line_ids).filtered(
+                lambda line: line.account_id.account_type == 'asset_receivable'
+                and line.parent_state == 'posted' and not line.reconciled)
+            if len(lines.move_id) > 1:
+                plan.append(lines)
+        if plan:
+            self.env['account.move.line']._reconcile_plan(plan)
 
-            # refresh to ensure residual is up to date
-            payment.invoice_id.flush(['paid_amount', 'residual'])
+    def action_confirm(self):
+        """Confirm the payments.
+        Payments are grouped by invoice and the total of each group is
+        validated against the invoice residual once. All payments are then
+        confirmed in one write and the fully paid invoices are marked as
+        paid in one write.
+        Raises:
+            ValidationError: If the payments of an invoice exceed its residual
+        Returns:
+            dict: Action to view the invoice when a single payment is confirmed
+        """
+        payments = self.filtered(lambda payment: payment.state != 'confirmed')
+        totals = defaultdict(float)
+        for payment in payments:
+            totals[payment.invoice_id] += payment.amount
+        for invoice, total in totals.items():
+            if invoice.currency_id.compare_amounts(total, invoice.residual) > 0:
+                raise ValidationError(_('Payment amount cannot exceed invoice amount.'))
 
-            if payment.invoice_id.residual <= 0:
-                payment.invoice_id.write({'state': 'paid'})
+        payments.write({'state': 'confirmed'})
+        paid_invoices = payments.invoice_id.filtered(
+            lambda invoice: invoice.currency_id.compare_amounts(invoice.residual, 0.0) <= 0)
+        paid_invoices.write({'state': 'paid'})
 
-        # if single record: return form view for invoice
-        self.ensure_one()
+        if len(self) != 1:
+            return True
         return {
             'type': 'ir.actions.act_window',
             'res_model': 'it.outsource.invoice',
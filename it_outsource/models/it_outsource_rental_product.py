@@ -1,5 +1,6 @@
 from odoo import models, fields, api, _
 from odoo.exceptions import ValidationError
+from odoo.tools import SQL
 
 
 class RentalProduct(models.Model):
@@ -25,7 +26,23 @@ class RentalProduct(models.Model):
 
     price = fields.Float(
         required=True,
-        help='Monthly rental price'
+        help='Monthly rental price, or price per unit for usage billing'
+    )
+    billing_method = fields.Selection([
+        ('fixed', 'Fixed Monthly Price'),
+        ('usage', 'Usage')
+    ], required=True,
+        default='fixed',
+        help='Bill a fixed monthly price, or the usage recorded in the period')
+    usage_unit = fields.Char(
+        string='Usage Unit',
+        help='Unit of the recorded usage, e.g. hours or GB'
+    )
+    income_account_id = fields.Many2one(
+        comodel_name='account.account',
+        string='Income Account',
+        help='Account of the journal items posted for this product, the '
+             'default account of the sales journal when empty'
     )
 
     cpu_count = fields.Integer(string='CPU Count')
@@ -46,6 +63,15 @@ class RentalProduct(models.Model):
         help='Contracts where this product is used'
     )
 
+    def init(self):
+        # Serves the best-fit lookup of _allocate_servers(): only available
+        # servers are indexed, in the order candidates are ranked.
+        self.env.cr.execute("""
+            CREATE INDEX IF NOT EXISTS it_outsource_product_available_server_idx
+                ON it_outsource_product (cpu_count, ram_gb, disk_space_gb, price, id)
+             WHERE product_type = 'server' AND state = 'available'
+        """)
+
     @api.constrains('price')
     def _check_price(self):
         """Validate the product price.
@@ -82,3 +108,48 @@ class RentalProduct(models.Model):
         This method changes the state of the product to 'maintenance'.
         """
         self.write({'state': 'maintenance'})
+
+    @api.model
+    def _allocate_servers(self, cpu_count=0, ram_gb=0.0, disk_space_gb=0.0, count=1):
+        """Reserve available servers matching the requirements.
+        Candidates are the available servers with at least the requested
+        specifications, ranked best fit first (smallest CPU, RAM and disk,
+        then cheapest), so bigger servers stay free for bigger requests.
+        The chosen rows are locked with ``FOR UPDATE SKIP LOCKED``, so
+        concurrent allocations never pick the same server, and are marked
+        as rented.
+        Args:
+            cpu_count (int): Minimum number of CPUs per server
+            ram_gb (float): Minimum RAM per server
+            disk_space_gb (float): Minimum disk space per server
+            count (int): Number of servers to allocate
+        Raises:
+            ValidationError: If not enough servers are available
+        Returns:
+            recordset: Allocated servers
+        """
+        if count < 1:
+            raise ValidationError(_('At least one server must be requested.'))
+        self.flush_model(['product_type', 'state', 'cpu_count', 'ram_gb', 'disk_space_gb', 'price'])
+        conditions = [SQL("product_type = 'server'"), SQL("state = 'available'")]
+        for column, minimum in (('cpu_count', cpu_count), ('ram_gb', ram_gb),
+                                ('disk_space_gb', disk_space_gb)):
+            if minimum:
+                conditions.append(SQL("%s >= %s", SQL.identifier(column), minimum))
+        self.env.cr.execute(SQL(
+            """SELECT id
+                 FROM it_outsource_product
+                WHERE %s
+             ORDER BY cpu_count, ram_gb, disk_space_gb, price, id
+                LIMIT %s
+                  FOR UPDATE SKIP LOCKED""",
+            SQL(' AND ').join(conditions), count,
+        ))
+        server_ids = [row[0] for row in self.env.cr.fetchall()]
+        if len(server_ids) < count:
+            raise ValidationError(_(
+                'Only %(available)s of %(requested)s matching servers are available.',
+                available=len(server_ids), requested=count))
+        servers = self.browse(server_ids)
+        servers.action_rent()
+        return servers
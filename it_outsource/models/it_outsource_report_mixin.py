@@ -0,0 +1,153 @@
+import hashlib
+import os
+import re
+import shutil
+import tempfile
+from contextlib import ExitStack
+
+from odoo import models, _
+from odoo.tools import SQL, split_every
+from odoo.tools.pdf import PdfFileReader, PdfFileWriter
+
+PDF_CHUNK_SIZE = 200
+# Size of the blocks read when hashing a merged PDF
+FILE_BLOCK_SIZE = 1 << 20
+# Names of the cached PDFs, ending with the content hash
+CACHED_PDF_NAME = re.compile(r'_[0-9a-f]{16}\.pdf$')
+
+
+class ReportMixin(models.AbstractModel):
+    """Cached PDF printing for IT outsourcing documents.
+    Documents inheriting this mixin are printed by a PDF report whose
+    attachment name contains a hash of the printed content. The rendered
+    PDF is stored on the first print and reused until the document changes,
+    which changes the hash and so the name; the outdated PDF is then
+    removed. Large selections are printed chunk by chunk and merged into a
+    single PDF on disk.
+    """
+    _name = 'it.outsource.report.mixin'
+    _description = 'Cached PDF Report Mixin'
+
+    # xmlid of the PDF report of the model
+    _pdf_report_xmlid = None
+
+    def _get_report_hash_values(self):
+        """Return the printed values of the document, as a hashable tuple.
+        By default any change of the document invalidates its cached PDF.
+        Models override this to hash only the values their report prints.
+        """
+        self.ensure_one()
+        return (self.id, self.write_date)
+
+    def _get_report_content_hash(self):
+        self.ensure_one()
+        return hashlib.sha256(repr(self._get_report_hash_values()).encode()).hexdigest()[:16]
+
+    def _get_report_attachment_name(self):
+        """Name of the cached PDF, used as the report attachment expression."""
+        self.ensure_one()
+        return '%s_%s.pdf' % (self._get_report_base_filename(), self._get_report_content_hash())
+
+    def _unlink_stale_report_attachments(self):
+        """Remove the cached PDFs of the documents that are outdated.
+        Cached PDFs are recognised by the content hash ending their name;
+        the one matching the current content of the document is kept.
+        """
+        attachments = self.env['ir.attachment'].sudo().search([
+            ('res_model', '=', self._name),
+            ('res_id', 'in', self.ids),
+            ('res_field', '=', False),
+            ('name', '=like', '%.pdf'),
+        ])
+        current = {doc.id: doc._get_report_attachment_name() for doc in self}
+        attachments.filtered(
+            lambda att: CACHED_PDF_NAME.search(att.name) and att.name != current[att.res_id]
+        ).unlink()
+
+    def _render_merged_pdf(self, merged_path, chunk_size=PDF_CHUNK_SIZE):
+        """Render the documents into one PDF file, chunk by chunk.
+        Each chunk is rendered, reusing cached documents, and spooled to a
+        temporary file before the cache is cleared, so memory does not grow
+        with the number of documents. The chunks are merged into
+        ``merged_path`` at the end.
+        Args:
+            merged_path (str): Path of the merged PDF to write
+            chunk_size (int): Number of documents rendered at once
+        """
+        Report = self.env['ir.actions.report']
+        with tempfile.TemporaryDirectory() as tmpdir, ExitStack() as stack:
+            writer = PdfFileWriter()
+            for index, ids in enumerate(split_every(chunk_size, self.ids, list)):
+                content, _format = Report._render_qweb_pdf(self._pdf_report_xmlid, res_ids=ids)
+                path = os.path.join(tmpdir, '%05d.pdf' % index)
+                with open(path, 'wb') as chunk_file:
+                    chunk_file.write(content)
+                del content
+                reader = PdfFileReader(stack.enter_context(open(path, 'rb')), strict=False)
+                for page in range(reader.getNumPages()):
+                    writer.addPage(reader.getPage(page))
+                self.env.invalidate_all()
+
+            with open(merged_path, 'wb') as merged_file:
+                writer.write(merged_file)
+
+    def _create_pdf_attachment(self, path, vals):
+        """Create a PDF attachment from a file without reading it in memory.
+        With the file storage, the file is hashed block by block and moved
+        into the filestore. create() ignores the storage values it is given,
+        so the attachment is created empty and pointed to the stored file
+        with a query.
+        Args:
+            path (str): Path of the PDF file, consumed by the call
+            vals (dict): Values of the attachment, such as its name
+        Returns:
+            ir.attachment: Created attachment
+        """
+        Attachment = self.env['ir.attachment']
+        vals = dict(vals, mimetype='application/pdf')
+        if Attachment._storage() != 'file':
+            with open(path, 'rb') as pdf_file:
+                return Attachment.create(dict(vals, raw=pdf_file.read()))
+        sha = hashlib.sha1()
+        with open(path, 'rb') as pdf_file:
+            for block in iter(lambda: pdf_file.read(FILE_BLOCK_SIZE), b''):
+                sha.update(block)
+        checksum = sha.hexdigest()
+        fname, full_path = Attachment._get_path(b'', checksum)
+        file_size = os.path.getsize(path)
+        if not os.path.exists(full_path):
+            shutil.move(path, full_path)
+        # collected by the filestore garbage collector if the transaction fails
+        Attachment._mark_for_gc(fname)
+        attachment = Attachment.create(vals)
+        self.env.cr.execute(SQL(
+            "UPDATE ir_attachment SET store_fname = %s, file_size = %s, checksum = %s WHERE id = %s",
+            fname, file_size, checksum, attachment.id,
+        ))
+        attachment.invalidate_recordset(['store_fname', 'file_size', 'checksum', 'raw', 'datas'])
+        return attachment
+
+    def action_print_merged_pdf(self):
+        """Print the selected documents as one PDF and download it.
+        Merged PDFs are attached to the model without a record, and the one
+        of the previous print of the user is removed, so downloads do not
+        accumulate.
+        """
+        self.env['ir.attachment'].search([
+            ('res_model', '=', self._name),
+            ('res_id', '=', False),
+            ('create_uid', '=', self.env.uid),
+            ('mimetype', '=', 'application/pdf'),
+        ]).unlink()
+        with tempfile.TemporaryDirectory() as tmpdir:
+            merged_path = os.path.join(tmpdir, 'merged.pdf')
+            self._render_merged_pdf(merged_path)
+            attachment = self._create_pdf_attachment(merged_path, {
+                'name': _('%(model)s (%(count)s).pdf', model=self._description, count=len(self)),
+                'res_model': self._name,
+            })
+        return {
+            'type': 'ir.actions.act_url',
+            'url': '/web/content/%s?download=true' % attachment.id,
+            'target': 'self',
+        }
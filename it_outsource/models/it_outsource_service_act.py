@@ -1,4 +1,7 @@
-from odoo import models, fields, api
+from odoo import models, fields, api, _
+from odoo.tools import SQL, date_utils, split_every
+
+ACT_BATCH_SIZE = 1000
 
 
 class ServiceAct(models.Model):
@@ -10,7 +13,8 @@ class ServiceAct(models.Model):
 
     _name = 'it.outsource.service.act'
     _description = 'Service Act'
-    _inherit = ['mail.thread', 'mail.activity.mixin']
+    _inherit = ['mail.thread', 'mail.activity.mixin', 'it.outsource.report.mixin']
+    _pdf_report_xmlid = 'it_outsource.action_report_service_report_pdf'
 
     name = fields.Char(
         string='Number',
@@ -32,6 +36,7 @@ class ServiceAct(models.Model):
         comodel_name='it.outsource.contract',
         string='Contract',
         required=True,
+        index=True,
         tracking=True,
         help='The contract under which services were provided'
     )
@@ -42,6 +47,19 @@ class ServiceAct(models.Model):
         tracking=True,
         help='Date when services were provided'
     )
+    period_start = fields.Date(
+        string='Billing Period',
+        copy=False,
+        help='First day of the month covered by the act'
+    )
+    invoice_id = fields.Many2one(
+        comodel_name='it.outsource.invoice',
+        string='Invoice',
+        copy=False,
+        index='btree_not_null',
+        ondelete='set null',
+        help='Invoice the act was generated from'
+    )
 
     # state = fields.Selection([
     #     ('draft', 'Draft'),
@@ -82,6 +100,14 @@ class ServiceAct(models.Model):
         for act in self:
             act.amount_total = sum(act.line_ids.mapped('subtotal'))
 
+    def init(self):
+        # One generated act per contract and billing period
+        self.env.cr.execute("""
+            CREATE UNIQUE INDEX IF NOT EXISTS it_outsource_service_act_contract_period_uniq
+                ON it_outsource_service_act (contract_id, period_start)
+             WHERE period_start IS NOT NULL
+        """)
+
     @api.model_create_multi
     def create(self, vals_list):
         """Create new service acts with sequence numbers.
@@ -92,9 +118,10 @@ class ServiceAct(models.Model):
         Returns:
             recordset: Newly created service acts
         """
-        for vals in vals_list:
-            if vals.get('name', 'New') == 'New':
-                vals['name'] = self.env['ir.sequence'].next_by_code('it.outsource.service.act') or 'New'
+        to_number = [vals for vals in vals_list if vals.get('name', 'New') == 'New']
+        names = self.env['ir.sequence'].next_many_by_code('it.outsource.service.act', len(to_number))
+        for vals, name in zip(to_number, names):
+            vals['name'] = name or 'New'
         return super().create(vals_list)
 
     # def action_validate(self):
@@ -134,3 +161,106 @@ class ServiceAct(models.Model):
         Returns the base filename for the doctor's report.
         """
         return f'Invoice_{self.name}_{self.date}'
+
+    def _get_report_hash_values(self):
+        self.ensure_one()
+        return (
+            self.name, self.date, self.contract_id.name,
+            self.contract_id.partner_id.name, self.currency_id.name,
+            self.amount_total, self.description,
+            tuple((line.product_id.display_name, line.quantity, line.unit,
+                   line.price, line.subtotal) for line in self.line_ids),
+        )
+
+    @api.model
+    def _without_act_condition(self, contract_column, period_start):
+        """Anti-join excluding the contracts having an act for a period."""
+        self.flush_model(['contract_id', 'period_start'])
+        return SQL(
+            """NOT EXISTS (SELECT 1 FROM it_outsource_service_act act
+                           WHERE act.contract_id = %s
+                             AND act.period_start = %s)""",
+            SQL(contract_column), period_start,
+        )
+
+    @api.model
+    def _prepare_line_vals(self, product, quantity, price):
+        return {
+            'product_id': product.id,
+            'quantity': quantity,
+            'price': price,
+            'unit': product.usage_unit if product.billing_method == 'usage' else _('month'),
+        }
+
+    @api.model
+    def _generate_acts(self, act_date, source='invoice', batch_size=ACT_BATCH_SIZE):
+        """Create the service acts of the billing period of ``act_date``.
+        With the ``invoice`` source, one act is created per invoice of the
+        period and its lines copy the invoice lines. With the ``contract``
+        source, one act is created per active contract and its lines bill
+        the contract products like an invoice would. Contracts already
+        having an act for the period are skipped with an anti-join, so
+        re-running the generation only creates the missing acts. Acts and
+        their lines are created ``batch_size`` acts per create() call.
+        Args:
+            act_date (date): Date of the acts
+            source (str): ``invoice`` or ``contract``
+            batch_size (int): Number of acts per create() call
+        Returns:
+            list: Ids of the created acts
+        """
+        period_start = date_utils.start_of(act_date, 'month')
+        if source == 'invoice':
+            vals_list = self._prepare_acts_from_invoices(act_date, period_start)
+        else:
+            vals_list = self._prepare_acts_from_contracts(act_date, period_start)
+
+        act_ids = []
+        for batch in split_every(batch_size, vals_list, list):
+            act_ids.extend(self.create(batch).ids)
+        return act_ids
+
+    @api.model
+    def _prepare_acts_from_invoices(self, act_date, period_start):
+        Invoice = self.env['it.outsource.invoice']
+        query = Invoice._search([('period_start', '=', period_start),
+                                 ('state', '!=', 'cancelled')], order='id')
+        query.add_where(self._without_act_condition(
+            '"it_outsource_invoice".contract_id', period_start))
+        invoices = Invoice.browse(query)
+        invoices.fetch(['contract_id', 'currency_id', 'line_ids'])
+        invoices.line_ids.fetch(['product_id', 'quantity', 'price_unit'])
+        invoices.line_ids.product_id.fetch(['billing_method', 'usage_unit'])
+        return [{
+            'contract_id': invoice.contract_id.id,
+            'invoice_id': invoice.id,
+            'currency_id': invoice.currency_id.id,
+            'date': act_date,
+            'period_start': period_start,
+            'line_ids': [(0, 0, self._prepare_line_vals(line.product_id, line.quantity, line.price_unit))
+                         for line in invoice.line_ids if line.product_id],
+        } for invoice in invoices]
+
+    @api.model
+    def _prepare_acts_from_contracts(self, act_date, period_start):
+        Contract = self.env['it.outsource.contract']
+        query = Contract._search([('state', '=', 'active')], order='id')
+        query.add_where(self._without_act_condition('"it_outsource_contract".id', period_start))
+        contracts = Contract.browse(query)
+        Product = self.env['it.outsource.product']
+        vals_list = []
+        for invoice_vals in contracts._prepare_invoice_vals_list(act_date):
+            vals_list.append({
+                'contract_id': invoice_vals['contract_id'],
+                'date': act_date,
+                'period_start': period_start,
+                'line_ids': [(0, 0, self._prepare_line_vals(
+                    Product.browse(line['product_id']), line['quantity'], line['price_unit']))
+                    for _command, _id, line in invoice_vals['line_ids']],
+            })
+        return vals_list
+
+    @api.model
+    def _cron_generate_acts(self):
+        """Create the acts of the invoices of the current month."""
+        self._generate_acts(fields.Date.context_today(self))
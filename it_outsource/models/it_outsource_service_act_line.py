@@ -14,6 +14,7 @@ class ServiceActLine(models.Model):
         comodel_name='it.outsource.service.act',
         string='Service Act',
         required=True,
+        index=True,
         ondelete='cascade',
         help='The service act this line belongs to'
     )
@@ -0,0 +1,167 @@
+from odoo import models, fields, api, _
+from odoo.exceptions import ValidationError
+from odoo.tools import SQL, split_every
+
+USAGE_BATCH_SIZE = 5000
+
+
+class UsageRecord(models.Model):
+    """Usage record model for IT outsourcing.
+    This class records metered consumption of a usage-billed product under
+    a contract, such as support hours, traffic or storage. Records are
+    append-only: they are ingested in bulk and summed per contract, product
+    and period when invoices are generated, and deleting a contract with
+    usage is refused. Corrections are recorded as new records with a
+    negative quantity.
+    """
+    _name = 'it.outsource.usage.record'
+    _description = 'Usage Record'
+    _order = 'date desc, id desc'
+    _log_access = False
+
+    contract_id = fields.Many2one(
+        comodel_name='it.outsource.contract',
+        string='Contract',
+        required=True,
+        readonly=True,
+        ondelete='restrict'
+    )
+    product_id = fields.Many2one(
+        comodel_name='it.outsource.product',
+        string='Product',
+        required=True,
+        readonly=True,
+        ondelete='restrict'
+    )
+    date = fields.Date(
+        required=True,
+        readonly=True,
+        help='Day the usage occurred'
+    )
+    quantity = fields.Float(
+        required=True,
+        readonly=True,
+        help='Consumed quantity, in the usage unit of the product'
+    )
+    usage_unit = fields.Char(related='product_id.usage_unit')
+
+    def init(self):
+        # Serves the per contract, product and period aggregation of billing
+        self.env.cr.execute("""
+            CREATE INDEX IF NOT EXISTS it_outsource_usage_record_contract_date_idx
+                ON it_outsource_usage_record (contract_id, date, product_id)
+        """)
+
+    def write(self, vals):
+        raise ValidationError(_('Usage records cannot be modified, record a correction instead.'))
+
+    @api.ondelete(at_uninstall=False)
+    def _unlink_except_append_only(self):
+        raise ValidationError(_('Usage records cannot be deleted, record a correction instead.'))
+
+    @api.model
+    def ingest(self, rows, batch_size=USAGE_BATCH_SIZE):
+        """Validate and insert usage records in bulk.
+        This is the entry point of the metering systems, callable over RPC.
+        Rows are validated batch by batch, then inserted by _ingest().
+        Corrections with a negative quantity are not accepted here.
+        Args:
+            rows (iterable): Dictionaries with ``contract_id``, ``product_id``,
+                ``date`` and ``quantity`` keys
+            batch_size (int): Number of rows validated and inserted at once
+        Raises:
+            AccessError: If the user may not create usage records
+            ValidationError: If a row is invalid
+        Returns:
+            int: Number of inserted records
+        """
+        self.check_access_rights('create')
+        return self._ingest(self._validate_rows(rows, batch_size), batch_size)
+
+    @api.model
+    def _validate_rows(self, rows, batch_size):
+        """Yield the rows as tuples once validated, batch by batch.
+        The active contracts of each batch and their products are read
+        with one search.
+        Args:
+            rows (iterable): Dictionaries with ``contract_id``, ``product_id``,
+                ``date`` and ``quantity`` keys
+            batch_size (int): Number of rows validated at once
+        Raises:
+            ValidationError: If the contract of a row is not active, its
+                product is not on the contract, its date is missing or its
+                quantity is negative
+        """
+        offset = 0
+        for batch in split_every(batch_size, rows, list):
+            try:
+                batch = [(
+                    int(row['contract_id']),
+                    int(row['product_id']),
+                    fields.Date.to_date(row['date']),
+                    float(row['quantity']),
+                ) for row in batch]
+            except (KeyError, TypeError, ValueError) as e:
+                raise ValidationError(_('Invalid usage record: %s', e))
+            contracts = self.env['it.outsource.contract'].search([
+                ('id', 'in', list({row[0] for row in batch})),
+                ('state', '=', 'active'),
+            ])
+            allowed = {(contract.id, product.id)
+                       for contract in contracts for product in contract.product_ids}
+            for number, row in enumerate(batch, start=offset + 1):
+                if (row[0], row[1]) not in allowed:
+                    raise ValidationError(_(
+                        'Usage record %(number)s: the product is not billed by an active contract.',
+                        number=number))
+                if not row[2]:
+                    raise ValidationError(_(
+                        'Usage record %(number)s: the date is missing.', number=number))
+                if row[3] < 0:
+                    raise ValidationError(_(
+                        'Usage record %(number)s: the quantity cannot be negative.',
+                        number=number))
+            offset += len(batch)
+            yield from batch
+
+    @api.model
+    def _ingest(self, rows, batch_size=USAGE_BATCH_SIZE):
+        """Insert usage records in bulk.
+        Rows are consumed lazily and inserted ``batch_size`` at a time with
+        one multi-row INSERT per batch, bypassing the ORM so millions of
+        records can be loaded without building recordsets.
+        Args:
+            rows (iterable): Tuples of (contract id, product id, date, quantity)
+            batch_size (int): Number of rows inserted per query
+        Returns:
+            int: Number of inserted records
+        """
+        count = 0
+        for batch in split_every(batch_size, rows, list):
+            self.env.cr.execute(SQL(
+                """INSERT INTO it_outsource_usage_record (contract_id, product_id, date, quantity)
+                   VALUES %s""",
+                SQL(', ').join(SQL('(%s, %s, %s, %s)', *row) for row in batch),
+            ))
+            count += len(batch)
+        return count
+
+    @api.model
+    def _get_period_usage(self, contract_ids, period_start, period_end):
+        """Sum the usage of contracts over a period.
+        Args:
+            contract_ids (list): Ids of the contracts
+            period_start (date): First day of the period
+            period_end (date): Last day of the period
+        Returns:
+            dict: Contract id -> {product: quantity}
+        """
+        groups = self._read_group([
+            ('contract_id', 'in', contract_ids),
+            ('date', '>=', period_start),
+            ('date', '<=', period_end),
+        ], ['contract_id', 'product_id'], ['quantity:sum'])
+        usage = {}
+        for contract, product, quantity in groups:
+            usage.setdefault(contract.id, {})[product] = quantity
+        return usage
@@ -1,4 +1,6 @@
-from odoo import models, fields, api
+from collections import defaultdict
+
+from odoo import models, fields
 
 
 class ResPartner(models.Model):
@@ -31,11 +33,69 @@ class ResPartner(models.Model):
         help='Number of contracts associated with this partner'
     )
 
-    @api.depends('contract_ids')
+    active_contract_count = fields.Integer(
+        compute='_compute_contract_count',
+        help='Number of active contracts associated with this partner'
+    )
+
+    rental_invoiced_amount = fields.Monetary(
+        string='Invoiced',
+        compute='_compute_rental_invoice_amounts',
+        currency_field='currency_id',
+        help='Total amount of the non-cancelled IT outsource invoices'
+    )
+
+    rental_due_amount = fields.Monetary(
+        string='Due',
+        compute='_compute_rental_invoice_amounts',
+        currency_field='currency_id',
+        help='Remaining balance of the IT outsource invoices'
+    )
+
+    rental_overdue_amount = fields.Monetary(
+        string='Overdue',
+        compute='_compute_rental_invoice_amounts',
+        currency_field='currency_id',
+        help='Remaining balance of the IT outsource invoices past their due date'
+    )
+
     def _compute_contract_count(self):
         """Compute the number of contracts for each partner.
-        This method calculates the total number of contracts associated with
-        each partner and stores it in the contract_count field.
+        This method counts all and active contracts of the whole recordset
+        with one grouped query instead of loading the contracts.
+        """
+        groups = self.env['it.outsource.contract']._read_group(
+            [('partner_id', 'in', self.ids)], ['partner_id', 'state'], ['__count'])
+        counts = defaultdict(int)
+        active_counts = defaultdict(int)
+        for partner, state, count in groups:
+            counts[partner.id] += count
+            if state == 'active':
+                active_counts[partner.id] += count
+        for partner in self:
+            partner.contract_count = counts[partner._origin.id]
+            partner.active_contract_count = active_counts[partner._origin.id]
+
+    def _compute_rental_invoice_amounts(self):
+        """Compute the invoiced, due and overdue amounts of each partner.
+        Each amount is aggregated for the whole recordset by one grouped
+        query over the stored invoice amount and residual, so the values are
+        always in line with the latest invoices and payments.
         """
+        Invoice = self.env['it.outsource.invoice']
+        invoiced = Invoice._read_group(
+            [('partner_id', 'in', self.ids), ('state', '!=', 'cancelled')],
+            ['partner_id'], ['amount:sum', 'residual:sum'])
+        overdue = Invoice._read_group(
+            [('partner_id', 'in', self.ids),
+             ('state', 'in', ('draft', 'sent')),
+             ('residual', '>', 0),
+             ('due_date', '<', fields.Date.context_today(self))],
+            ['partner_id'], ['residual:sum'])
+        totals = {partner.id: (amount, residual) for partner, amount, residual in invoiced}
+        overdue_totals = {partner.id: residual for partner, residual in overdue}
         for partner in self:
-            partner.contract_count = len(partner.contract_ids)
+            amount, residual = totals.get(partner._origin.id, (0.0, 0.0))
+            partner.rental_invoiced_amount = amount
+            partner.rental_due_amount = residual
+            partner.rental_overdue_amount = overdue_totals.get(partner._origin.id, 0.0)
@@ -0,0 +1 @@
+from . import it_outsource_invoice_aging_report, it_outsource_capacity_snapshot, it_outsource_document_reports
@@ -0,0 +1,68 @@
+from odoo import models, fields, api
+
+
+class CapacitySnapshot(models.Model):
+    """Daily capacity snapshot for IT outsourcing.
+    This class keeps one row per day, product type and status with the
+    number of products and their total CPU, RAM, disk space and monthly
+    price. Rows are written by a daily cron with a single aggregate query,
+    so capacity trends are read from this small table instead of the
+    live inventory.
+    """
+    _name = 'it.outsource.capacity.snapshot'
+    _description = 'Capacity Snapshot'
+    _order = 'date desc, product_type, state'
+    _rec_name = 'date'
+
+    date = fields.Date(required=True, readonly=True, index=True)
+    product_type = fields.Selection([
+        ('server', 'Server'),
+        ('service', 'Service')
+    ], string='Type', required=True, readonly=True)
+    state = fields.Selection([
+        ('available', 'Available'),
+        ('rented', 'Rented'),
+        ('maintenance', 'Maintenance')
+    ], string='Status', required=True, readonly=True)
+    product_count = fields.Integer(string='Products', readonly=True, group_operator='sum')
+    cpu_count = fields.Integer(string='CPU Count', readonly=True, group_operator='sum')
+    ram_gb = fields.Float(string='RAM (GB)', readonly=True, group_operator='sum')
+    disk_space_gb = fields.Float(string='Disk Space (GB)', readonly=True, group_operator='sum')
+    price = fields.Float(string='Monthly Price', readonly=True, group_operator='sum')
+
+    _sql_constraints = [
+        ('date_type_state_uniq', 'unique(date, product_type, state)',
+         'Only one capacity snapshot per day, type and status is allowed.'),
+    ]
+
+    @api.model
+    def _take_snapshot(self, date=None):
+        """Store the capacity of the inventory for a day.
+        Products are aggregated by type and status and inserted with one
+        ``INSERT ... SELECT``. Taking the snapshot again the same day
+        replaces the rows of that day.
+        Args:
+            date (date): Day of the snapshot, today by default
+        """
+        date = date or fields.Date.context_today(self)
+        self.env['it.outsource.product'].flush_model(
+            ['product_type', 'state', 'cpu_count', 'ram_gb', 'disk_space_gb', 'price'])
+        # products may have left a status since the last snapshot of the day
+        self.env.cr.execute("DELETE FROM it_outsource_capacity_snapshot WHERE date = %s", [date])
+        self.env.cr.execute("""
+            INSERT INTO it_outsource_capacity_snapshot
+                        (date, product_type, state, product_count, cpu_count, ram_gb,
+                         disk_space_gb, price, create_uid, create_date, write_uid, write_date)
+                 SELECT %(date)s, product_type, state, COUNT(*),
+                        COALESCE(SUM(cpu_count), 0), COALESCE(SUM(ram_gb), 0),
+                        COALESCE(SUM(disk_space_gb), 0), COALESCE(SUM(price), 0),
+                        %(uid)s, NOW() AT TIME ZONE 'UTC', %(uid)s, NOW() AT TIME ZONE 'UTC'
+                   FROM it_outsource_product
+                  WHERE state IS NOT NULL
+               GROUP BY product_type, state
+        """, {'date': date, 'uid': self.env.uid})
+        self.invalidate_model()
+
+    @api.model
+    def _cron_take_snapshot(self):
+        self._take_snapshot()
@@ -0,0 +1,73 @@
+from odoo import models, api
+
+
+class InvoiceReport(models.AbstractModel):
+    """Data provider of the invoice report.
+    The contracts, clients, lines and products of all printed invoices are
+    read in a few batched queries, and the template renders plain values
+    instead of following relations record by record.
+    """
+    _name = 'report.it_outsource.report_server_rental_invoice_document'
+    _description = 'Invoice Report'
+
+    @api.model
+    def _get_report_values(self, docids, data=None):
+        docs = self.env['it.outsource.invoice'].browse(docids)
+        docs.fetch(['name', 'date', 'due_date', 'contract_id', 'currency_id', 'line_ids',
+                    'amount', 'paid_amount', 'residual'])
+        docs.contract_id.fetch(['name', 'partner_id'])
+        docs.contract_id.partner_id.fetch(['name'])
+        docs.line_ids.fetch(['product_id', 'description', 'quantity', 'price_unit', 'amount'])
+        docs.line_ids.product_id.fetch(['name'])
+        return {
+            'doc_ids': docids,
+            'doc_model': 'it.outsource.invoice',
+            'docs': docs,
+            'doc_values': {doc.id: {
+                'partner_name': doc.contract_id.partner_id.name,
+                'contract_name': doc.contract_id.name,
+                'lines': [{
+                    'product_name': line.product_id.name or '',
+                    'description': line.description or '',
+                    'quantity': line.quantity,
+                    'price_unit': line.price_unit,
+                    'amount': line.amount,
+                } for line in doc.line_ids],
+            } for doc in docs},
+        }
+
+
+class ServiceActReport(models.AbstractModel):
+    """Data provider of the work completion certificate.
+    The contracts, clients, lines and products of all printed acts are read
+    in a few batched queries, and the template renders plain values instead
+    of following relations record by record.
+    """
+    _name = 'report.it_outsource.report_service_report_document'
+    _description = 'Work Completion Certificate Report'
+
+    @api.model
+    def _get_report_values(self, docids, data=None):
+        docs = self.env['it.outsource.service.act'].browse(docids)
+        docs.fetch(['name', 'date', 'contract_id', 'currency_id', 'line_ids',
+                    'amount_total', 'description'])
+        docs.contract_id.fetch(['name', 'partner_id'])
+        docs.contract_id.partner_id.fetch(['name'])
+        docs.line_ids.fetch(['product_id', 'quantity', 'unit', 'price', 'subtotal'])
+        docs.line_ids.product_id.fetch(['name'])
+        return {
+            'doc_ids': docids,
+            'doc_model': 'it.outsource.service.act',
+            'docs': docs,
+            'doc_values': {doc.id: {
+                'partner_name': doc.contract_id.partner_id.name,
+                'contract_name': doc.contract_id.name,
+                'lines': [{
+                    'product_name': line.product_id.name,
+                    'quantity': line.quantity,
+                    'unit': line.unit or '',
+                    'price': line.price,
+                    'subtotal': line.subtotal,
+                } for line in doc.line_ids],
+            } for doc in docs},
+        }
@@ -0,0 +1,108 @@
+from odoo import models, fields, api
+
+
+class InvoiceAgingReport(models.Model):
+    """Receivables aging report for IT outsourcing.
+    This read-only model is backed by a materialized view joining invoices,
+    their confirmed payments and partners. Amounts, paid amounts, residuals
+    and aging buckets are computed in the database, and a cron refreshes the
+    view so aging analysis over many invoices is a single query.
+    """
+    _name = 'it.outsource.invoice.aging.report'
+    _description = 'Receivables Aging Report'
+    _auto = False
+    _rec_name = 'invoice_id'
+    _order = 'due_date, id'
+
+    invoice_id = fields.Many2one(
+        comodel_name='it.outsource.invoice',
+        string='Invoice',
+        readonly=True)
+    contract_id = fields.Many2one(
+        comodel_name='it.outsource.contract',
+        string='Contract',
+        readonly=True)
+    partner_id = fields.Many2one(
+        comodel_name='res.partner',
+        string='Client',
+        readonly=True)
+    currency_id = fields.Many2one(
+        comodel_name='res.currency',
+        string='Currency',
+        readonly=True)
+    date = fields.Date(string='Invoice Date', readonly=True)
+    due_date = fields.Date(readonly=True)
+    state = fields.Selection([
+        ('draft', 'Draft'),
+        ('sent', 'Sent'),
+    ], string='Status', readonly=True)
+    days_overdue = fields.Integer(readonly=True)
+    amount = fields.Monetary(currency_field='currency_id', readonly=True)
+    paid_amount = fields.Monetary(currency_field='currency_id', readonly=True)
+    residual = fields.Monetary(
+        string='Balance Due',
+        currency_field='currency_id',
+        readonly=True)
+    amount_0_30 = fields.Monetary(string='0-30', currency_field='currency_id', readonly=True)
+    amount_31_60 = fields.Monetary(string='31-60', currency_field='currency_id', readonly=True)
+    amount_61_90 = fields.Monetary(string='61-90', currency_field='currency_id', readonly=True)
+    amount_90_plus = fields.Monetary(string='90+', currency_field='currency_id', readonly=True)
+
+    def _query(self):
+        return """
+            WITH paid AS (
+                SELECT invoice_id, SUM(amount) AS paid_amount
+                  FROM it_outsource_payment
+                 WHERE state = 'confirmed'
+              GROUP BY invoice_id
+            ), open_invoice AS (
+                SELECT inv.id,
+                       inv.contract_id,
+                       partner.commercial_partner_id AS partner_id,
+                       inv.currency_id,
+                       inv.date,
+                       COALESCE(inv.due_date, inv.date) AS due_date,
+                       inv.state,
+                       GREATEST(CURRENT_DATE - COALESCE(inv.due_date, inv.date), 0) AS days_overdue,
+                       COALESCE(inv.amount, 0) AS amount,
+                       COALESCE(paid.paid_amount, 0) AS paid_amount,
+                       COALESCE(inv.amount, 0) - COALESCE(paid.paid_amount, 0) AS residual
+                  FROM it_outsource_invoice inv
+                  JOIN it_outsource_contract contract ON contract.id = inv.contract_id
+                  JOIN res_partner partner ON partner.id = contract.partner_id
+             LEFT JOIN paid ON paid.invoice_id = inv.id
+                 WHERE inv.state IN ('draft', 'sent')
+            )
+            SELECT id,
+                   id AS invoice_id,
+                   contract_id,
+                   partner_id,
+                   currency_id,
+                   date,
+                   due_date,
+                   state,
+                   days_overdue,
+                   amount,
+                   paid_amount,
+                   residual,
+                   CASE WHEN days_overdue <= 30 THEN residual ELSE 0 END AS amount_0_30,
+                   CASE WHEN days_overdue BETWEEN 31 AND 60 THEN residual ELSE 0 END AS amount_31_60,
+                   CASE WHEN days_overdue BETWEEN 61 AND 90 THEN residual ELSE 0 END AS amount_61_90,
+                   CASE WHEN days_overdue > 90 THEN residual ELSE 0 END AS amount_90_plus
+              FROM open_invoice
+        """
+
+    def init(self):
+        self.env.cr.execute("DROP MATERIALIZED VIEW IF EXISTS %s CASCADE" % self._table)
+        self.env.cr.execute("CREATE MATERIALIZED VIEW %s AS (%s)" % (self._table, self._query()))
+        # A unique index is required to refresh the view concurrently
+        self.env.cr.execute("CREATE UNIQUE INDEX %s_id_idx ON %s (id)" % (self._table, self._table))
+        self.env.cr.execute("CREATE INDEX %s_partner_id_idx ON %s (partner_id)" % (self._table, self._table))
+
+    @api.model
+    def _cron_refresh(self):
+        """Refresh the aging figures without blocking readers."""
+        self.env['it.outsource.invoice'].flush_model()
+        self.env['it.outsource.payment'].flush_model()
+        self.env.cr.execute("REFRESH MATERIALIZED VIEW CONCURRENTLY %s" % self._table)
+        self.invalidate_model()
@@ -1,6 +1,21 @@
-from . import (test_contract,
+from . import (test_accounting_bridge,
+               test_billing_job,
+               test_capacity_snapshot,
+               test_contract,
+               test_contract_lifecycle,
+               test_indexes,
                test_invoice,
+               test_invoice_aging_report,
+               test_invoice_export,
+               test_invoice_mail,
+               test_invoice_payment,
+               test_invoice_report,
+               test_invoice_wizard,
                test_payment,
+               test_payment_import,
                test_product,
-               test_service_act
+               test_res_partner,
+               test_service_act,
+               test_sync_api,
+               test_usage_record
                )
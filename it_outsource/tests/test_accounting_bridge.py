@@ -0,0 +1,88 @@
+from datetime import date, timedelta
+
+from odoo.addons.account.tests.common import AccountTestInvoicingCommon
+from odoo.tests import tagged
+
+
+@tagged('post_install', '-at_install')
+class TestAccountingBridge(AccountTestInvoicingCommon):
+    """Test suite for posting rental invoices and payments to accounting.
+    Attributes:
+        invoices (it.outsource.invoice): Two sent rental invoices
+    """
+
+    @classmethod
+    def setUpClass(cls, chart_template_ref=None):
+        """Set up test data for all test methods.
+        Creates the necessary test records:
+        - Two active contracts billing one server
+        - One sent invoice per contract
+        """
+        super().setUpClass(chart_template_ref=chart_template_ref)
+        server = cls.env['it.outsource.product'].create({
+            'name': 'Test Server',
+            'product_type': 'server',
+            'price': 1000.0,
+        })
+        contracts = cls.env['it.outsource.contract'].create([{
+            'partner_id': cls.partner_a.id,
+            'start_date': date.today(),
+            'end_date': date.today() + timedelta(days=365),
+            'product_ids': [(4, server.id)],
+        } for _i in range(2)])
+        contracts.action_activate()
+        cls.invoices = cls.env['it.outsource.invoice'].browse(
+            contracts._create_invoices(date.today() + timedelta(days=40)))
+        cls.invoices.write({'state': 'sent', 'currency_id': cls.company_data['currency'].id})
+
+    def test_01_post_invoices_and_payments(self):
+        """Test the accounting bridge end to end.
+        Verifies that:
+        - Every sent invoice gets one posted customer invoice
+        - Posting again creates nothing
+        - A confirmed payment is posted and reconciled with its invoice
+        """
+        Invoice = self.env['it.outsource.invoice']
+        moves = Invoice._search_unposted()._post_to_accounting()
+        self.assertEqual(moves.it_outsource_invoice_id, self.invoices)
+        self.assertEqual(set(moves.mapped('state')), {'posted'})
+        self.assertEqual(moves[0].amount_total, 1000.0)
+        self.assertFalse(Invoice._search_unposted() & self.invoices)
+
+        payment = self.env['it.outsource.payment'].create({
+            'invoice_id': self.invoices[0].id,
+            'amount': 1000.0,
+            'date': date.today(),
+            'payment_method': 'bank',
+        })
+        payment.action_confirm()
+        Invoice._cron_post_to_accounting()
+        self.assertEqual(payment.account_payment_ids.state, 'posted')
+        self.assertEqual(self.invoices[0].account_move_ids.payment_state,
+                         self.env['account.move']._get_invoice_in_payment_state())
+
+    def test_02_payment_before_invoice(self):
+        """Test a payment confirmed before its invoice is posted.
+        Verifies that:
+        - The payment waits until its invoice is posted in accounting
+        - It is then posted and reconciled with the customer invoice
+        - Bank payments are posted without any cash journal
+        """
+        self.env['account.journal'].search([
+            ('type', '=', 'cash'),
+            ('company_id', '=', self.env.company.id),
+        ]).action_archive()
+        payment = self.env['it.outsource.payment'].create({
+            'invoice_id': self.invoices[1].id,
+            'amount': 1000.0,
+            'date': date.today(),
+            'payment_method': 'bank',
+        })
+        payment.action_confirm()
+        Payment = self.env['it.outsource.payment']
+        self.assertFalse(Payment._search_unposted() & payment)
+
+        self.env['it.outsource.invoice']._cron_post_to_accounting()
+        self.assertEqual(payment.account_payment_ids.state, 'posted')
+        self.assertEqual(self.invoices[1].account_move_ids.payment_state,
+                         self.env['account.move']._get_invoice_in_payment_state())
@@ -0,0 +1,180 @@
+from contextlib import closing
+from datetime import date, timedelta
+from unittest.mock import patch
+
+from odoo import api, SUPERUSER_ID
+from odoo.modules.registry import Registry
+from odoo.tests import tagged
+from odoo.tests.common import BaseCase, TransactionCase, get_db_name
+
+
+class TestBillingJob(TransactionCase):
+    """Test suite for scheduled billing runs.
+    Attributes:
+        partner (res.partner): Test partner record
+        server (it.outsource.product): Test server product record
+        contracts (it.outsource.contract): Active test contracts
+    """
+
+    @classmethod
+    def setUpClass(cls):
+        """Set up test data for all test methods.
+        Creates the necessary test records:
+        - A test partner
+        - A test server product
+        - Three active contracts
+        """
+        super().setUpClass()
+        cls.partner = cls.env['res.partner'].create({'name': 'Test Client'})
+        cls.server = cls.env['it.outsource.product'].create({
+            'name': 'Test Server',
+            'product_type': 'server',
+            'price': 1000.0,
+        })
+        cls.contracts = cls.env['it.outsource.contract'].create([{
+            'partner_id': cls.partner.id,
+            'start_date': date.today(),
+            'end_date': date.today() + timedelta(days=365),
+            'product_ids': [(4, cls.server.id)],
+        } for _i in range(3)])
+        cls.contracts.action_activate()
+
+    def _create_job(self):
+        return self.env['it.outsource.billing.job'].create({
+            'date': date.today(),
+            'state': 'running',
+        })
+
+    def test_01_run_in_chunks(self):
+        """Test that a job bills every contract chunk by chunk.
+        Verifies that:
+        - One invoice is created per contract and linked to the job
+        - The job ends in done state
+        """
+        job = self._create_job()
+        job._run(chunk_size=2)
+        self.assertEqual(job.state, 'done')
+        self.assertEqual(job.invoice_ids.contract_id & self.contracts, self.contracts)
+
+    def test_02_resume_after_interruption(self):
+        """Test that a restarted job skips contracts it already billed.
+        Verifies that:
+        - A contract billed by an earlier run of the job is not billed again
+        - Already billed contracts are not claimed anymore
+        """
+        job = self._create_job()
+        self.contracts[0]._create_invoices(date.today(), extra_vals={'billing_job_id': job.id})
+        claimed = job._claim_contracts(job._get_contract_domain(), 10, lock=False)
+        self.assertNotIn(self.contracts[0], claimed)
+        job._run()
+        self.assertEqual(len(job.invoice_ids.filtered(
+            lambda invoice: invoice.contract_id == self.contracts[0])), 1)
+        self.assertEqual(job.invoice_ids.contract_id & self.contracts, self.contracts)
+
+    def test_03_failures_are_logged(self):
+        """Test that a failing contract does not abort the run.
+        Verifies that:
+        - The failing contract is logged on the job
+        - The other contracts are still billed
+        """
+        failing = self.contracts[1]
+        Contract = type(self.env['it.outsource.contract'])
+        prepare = Contract._prepare_invoice_vals
+
+        def _prepare_invoice_vals(contract, invoice_date, *args, **kwargs):
+            if contract == failing:
+                raise ValueError('Broken contract')
+            return prepare(contract, invoice_date, *args, **kwargs)
+
+        job = self._create_job()
+        with patch.object(Contract, '_prepare_invoice_vals', _prepare_invoice_vals):
+            job._run()
+        self.assertEqual(job.state, 'done')
+        self.assertEqual(job.log_ids.contract_id, failing)
+        self.assertEqual(job.invoice_ids.contract_id & self.contracts, self.contracts - failing)
+
+
+@tagged('post_install', '-at_install')
+class TestBillingJobConcurrency(BaseCase):
+    """Test suite for billing workers whose transactions overlap.
+    Concurrent cursors do not see the data of a test transaction, so this
+    class commits its own job and contracts and removes them through the
+    ORM once its tests are done. No transaction of the test runner is held
+    open meanwhile, so the workers cannot wait on its locks.
+    Attributes:
+        job_id (int): Id of the running test job
+        contract_ids (list): Ids of the active test contracts
+    """
+
+    @classmethod
+    def setUpClass(cls):
+        """Set up and commit the test data of the class.
+        Creates the necessary test records:
+        - A test partner and server product
+        - Two active contracts
+        - A running billing job
+        """
+        super().setUpClass()
+        cls.registry = Registry(get_db_name())
+        with cls.registry.cursor() as cr:
+            env = api.Environment(cr, SUPERUSER_ID, {'tracking_disable': True})
+            partner = env['res.partner'].create({'name': 'Concurrent Client'})
+            server = env['it.outsource.product'].create({
+                'name': 'Concurrent Server',
+                'product_type': 'server',
+                'price': 1000.0,
+            })
+            contracts = env['it.outsource.contract'].create([{
+                'partner_id': partner.id,
+                'start_date': date.today(),
+                'end_date': date.today() + timedelta(days=365),
+                'product_ids': [(4, server.id)],
+            } for _i in range(2)])
+            contracts.action_activate()
+            job = env['it.outsource.billing.job'].create({'date': date.today(), 'state': 'running'})
+        cls.addClassCleanup(cls._delete_data, partner.id, server.id, contracts.ids, job.id)
+        cls.job_id = job.id
+        cls.contract_ids = contracts.ids
+
+    @classmethod
+    def _delete_data(cls, partner_id, product_id, contract_ids, job_id):
+        with cls.registry.cursor() as cr:
+            env = api.Environment(cr, SUPERUSER_ID, {})
+            env['it.outsource.invoice'].search([('contract_id', 'in', contract_ids)]).unlink()
+            env['it.outsource.billing.job'].browse(job_id).unlink()
+            env['it.outsource.contract'].browse(contract_ids).unlink()
+            env['it.outsource.product'].browse(product_id).unlink()
+            env['res.partner'].browse(partner_id).unlink()
+
+    def test_01_concurrent_workers(self):
+        """Test two workers whose transactions overlap.
+        Worker B starts its transaction before worker A bills and commits
+        the contracts, so the snapshot of B does not see the invoices of A.
+        Verifies that:
+        - Worker B does not bill the contracts claimed by worker A
+        - Worker B stops without marking the job done and wakes up the
+          billing workers to resume it
+        - Every contract is billed exactly once
+        """
+        with closing(self.registry.cursor()) as cr_a, closing(self.registry.cursor()) as cr_b:
+            context = {'tracking_disable': True}
+            job_a = api.Environment(cr_a, SUPERUSER_ID, context)['it.outsource.billing.job'].browse(self.job_id)
+            job_b = api.Environment(cr_b, SUPERUSER_ID, context)['it.outsource.billing.job'].browse(self.job_id)
+            domain = [('id', 'in', self.contract_ids)] + job_a._get_contract_domain()
+
+            # worker B takes its snapshot before worker A commits
+            cr_b.execute("SELECT 1")
+            job_a._bill_contracts(job_a._claim_contracts(domain, 10))
+            cr_a.commit()
+
+            Cron = type(job_b.env['ir.cron'])
+            with patch.object(type(job_b), '_get_contract_domain', lambda job: domain), \
+                    patch.object(Cron, '_trigger', autospec=True) as trigger:
+                job_b._run()
+            self.assertEqual(job_b.state, 'running')
+            trigger.assert_called()
+            cr_b.rollback()
+
+            invoices = job_b.invoice_ids
+            self.assertEqual(len(invoices), 2)
+            self.assertEqual(sorted(invoices.contract_id.ids), sorted(self.contract_ids))
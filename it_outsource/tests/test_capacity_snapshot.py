@@ -0,0 +1,50 @@
+from datetime import date
+from odoo.tests.common import TransactionCase
+
+
+class TestCapacitySnapshot(TransactionCase):
+    """Test suite for the daily capacity snapshot.
+    Attributes:
+        servers (it.outsource.product): One available and one rented server
+    """
+
+    @classmethod
+    def setUpClass(cls):
+        """Set up test data for all test methods.
+        Creates the necessary test records:
+        - An available and a rented server
+        """
+        super().setUpClass()
+        cls.servers = cls.env['it.outsource.product'].create([{
+            'name': 'Test Server %s' % state,
+            'product_type': 'server',
+            'price': 1000.0,
+            'cpu_count': 8,
+            'ram_gb': 64.0,
+            'disk_space_gb': 1000.0,
+            'state': state,
+        } for state in ('available', 'rented')])
+
+    def test_01_take_snapshot(self):
+        """Test that a snapshot aggregates the inventory by status.
+        Verifies that:
+        - The rented capacity includes the rented test server
+        - Taking the snapshot again the same day replaces the rows of the day
+        """
+        Snapshot = self.env['it.outsource.capacity.snapshot']
+        day = date(2020, 1, 1)
+        Snapshot._take_snapshot(day)
+        rented = Snapshot.search([('date', '=', day), ('product_type', '=', 'server'),
+                                  ('state', '=', 'rented')])
+        self.assertGreaterEqual(rented.cpu_count, 8)
+        rented_count = rented.product_count
+        self.assertGreaterEqual(rented_count, 1)
+
+        self.servers.action_maintenance()
+        Snapshot._take_snapshot(day)
+        rows = Snapshot.search([('date', '=', day), ('product_type', '=', 'server')])
+        self.assertEqual(len(rows), len(set(rows.mapped('state'))))
+        self.assertEqual(rows.filtered(lambda row: row.state == 'rented').product_count,
+                         rented_count - 1)
+        maintenance = rows.filtered(lambda row: row.state == 'maintenance')
+        self.assertGreaterEqual(maintenance.product_count, 2)
@@ -0,0 +1,61 @@
+from datetime import date, timedelta
+from odoo.tests.common import TransactionCase
+
+
+class TestContractLifecycle(TransactionCase):
+    """Test suite for the contract expiry and renewal cron.
+    Attributes:
+        partner (res.partner): Test partner record
+        servers (it.outsource.product): Two rented test servers
+        contracts (it.outsource.contract): Two ended active contracts
+    """
+
+    @classmethod
+    def setUpClass(cls):
+        """Set up test data for all test methods.
+        Creates the necessary test records:
+        - A test partner and two rented servers
+        - Two active contracts that ended yesterday, one flagged for renewal
+        """
+        super().setUpClass()
+        cls.partner = cls.env['res.partner'].create({'name': 'Test Client'})
+        cls.servers = cls.env['it.outsource.product'].create([{
+            'name': 'Test Server %s' % index,
+            'product_type': 'server',
+            'price': 1000.0,
+            'state': 'rented',
+        } for index in range(2)])
+        cls.contracts = cls.env['it.outsource.contract'].create([{
+            'partner_id': cls.partner.id,
+            'start_date': date.today(),
+            'end_date': date.today() + timedelta(days=30),
+            'product_ids': [(4, server.id)],
+            'auto_renew': auto_renew,
+        } for server, auto_renew in zip(cls.servers, (True, False))])
+        cls.contracts.action_activate()
+        # move the contracts into the past without triggering date checks
+        cls.env.cr.execute(
+            "UPDATE it_outsource_contract SET start_date = %s, end_date = %s WHERE id IN %s",
+            (date.today() - timedelta(days=31), date.today() - timedelta(days=1),
+             tuple(cls.contracts.ids)))
+        cls.contracts.invalidate_recordset(['start_date', 'end_date'])
+
+    def test_01_expire_and_renew(self):
+        """Test the daily contract lifecycle cron.
+        Verifies that:
+        - Ended contracts are expired
+        - The auto-renewed contract gets an active successor keeping its server
+        - The server of the other contract is released
+        """
+        self.env['it.outsource.contract']._cron_expire_contracts()
+        self.assertEqual(set(self.contracts.mapped('state')), {'expired'})
+
+        renewal = self.env['it.outsource.contract'].search(
+            [('renewed_from_id', '=', self.contracts[0].id)])
+        self.assertEqual(renewal.state, 'active')
+        self.assertEqual(renewal.start_date, date.today())
+        self.assertEqual(renewal.end_date, date.today() + timedelta(days=30))
+        self.assertEqual(renewal.product_ids, self.servers[0])
+
+        self.assertEqual(self.servers[0].state, 'rented')
+        self.assertEqual(self.servers[1].state, 'available')
@@ -0,0 +1,203 @@
+from datetime import date, timedelta
+from odoo.tests.common import TransactionCase
+from odoo.tools import SQL
+
+# Number of copies of the created records loaded into each table
+FIXTURE_COPIES = 200
+
+
+class TestIndexes(TransactionCase):
+    """Test suite for the indexes behind the hot domains of the module.
+    Each domain used by the views, wizards and computes is compiled to SQL
+    with _search(), without its default order, and explained with
+    sequential scans disabled. The plan must read the index meant for the
+    domain, not merely any index of the table.
+    Attributes:
+        partners (res.partner): Test partner records
+        contracts (it.outsource.contract): Active test contracts
+        invoices (it.outsource.invoice): Invoices of the contracts
+    """
+
+    @classmethod
+    def setUpClass(cls):
+        """Set up test data for all test methods.
+        Creates the necessary test records:
+        - Ten partners sharing fifty active contracts
+        - One invoice per contract, half of them paid
+        - One service act per invoice
+        Each table is then filled with copies of these records, most of
+        them expired, paid or without period, like a database holding years
+        of history, and analyzed.
+        """
+        super().setUpClass()
+        cls.env = cls.env(context=dict(cls.env.context, tracking_disable=True))
+        cls.partners = cls.env['res.partner'].create([
+            {'name': 'Test Client %s' % i} for i in range(10)])
+        server = cls.env['it.outsource.product'].create({
+            'name': 'Test Server',
+            'product_type': 'server',
+            'price': 1000.0,
+        })
+        cls.contracts = cls.env['it.outsource.contract'].create([{
+            'partner_id': cls.partners[i % 10].id,
+            'start_date': date.today(),
+            'end_date': date.today() + timedelta(days=365),
+            'product_ids': [(4, server.id)],
+        } for i in range(50)])
+        cls.contracts.action_activate()
+
+        invoice_date = date.today() + timedelta(days=40)
+        cls.invoices = cls.env['it.outsource.invoice'].browse(
+            cls.contracts._create_invoices(invoice_date))
+        cls.env['it.outsource.payment'].create([{
+            'invoice_id': invoice.id,
+            'amount': invoice.amount,
+            'date': invoice_date,
+            'payment_method': 'bank',
+        } for invoice in cls.invoices[::2]]).action_confirm()
+        cls.env['it.outsource.service.act']._generate_acts(invoice_date)
+        cls.env.flush_all()
+
+        cls._copy_rows('it_outsource_contract', {
+            'state': "CASE WHEN mod(g, 5) = 0 THEN state ELSE 'expired' END",
+            'end_date': 'end_date - g',
+        })
+        cls._copy_rows('it_outsource_invoice', {
+            'period_start': 'NULL',
+            'state': "CASE WHEN mod(g, 10) = 0 THEN state ELSE 'paid' END",
+            'residual': 'CASE WHEN mod(g, 10) = 0 THEN residual ELSE 0 END',
+            'date': 'date - g',
+            'due_date': 'due_date - g',
+        })
+        cls._copy_rows('it_outsource_invoice_line', {})
+        cls._copy_rows('it_outsource_payment', {})
+        cls._copy_rows('it_outsource_service_act', {'period_start': 'NULL'})
+        cls._copy_rows('it_outsource_service_act_line', {})
+        cls.env.cr.execute("""
+            ANALYZE it_outsource_contract, it_outsource_invoice,
+                    it_outsource_invoice_line, it_outsource_payment,
+                    it_outsource_service_act, it_outsource_service_act_line
+        """)
+
+    @classmethod
+    def _copy_rows(cls, table, overrides):
+        """Insert ``FIXTURE_COPIES`` copies of every row of a table.
+        Args:
+            table (str): Table to fill
+            overrides (dict): Column -> SQL expression of the copied value,
+                where ``g`` is the number of the copy
+        """
+        cls.env.cr.execute("""
+            SELECT column_name FROM information_schema.columns
+             WHERE table_name = %s AND column_name != 'id'
+        """, [table])
+        columns = [row[0] for row in cls.env.cr.fetchall()]
+        cls.env.cr.execute(SQL(
+            "INSERT INTO %s (%s) SELECT %s FROM %s, generate_series(1, %s) AS g",
+            SQL.identifier(table),
+            SQL(', ').join(SQL.identifier(column) for column in columns),
+            SQL(', ').join(SQL(overrides[column]) if column in overrides else SQL.identifier(column)
+                           for column in columns),
+            SQL.identifier(table),
+            FIXTURE_COPIES,
+        ))
+
+    def _get_column_index(self, table, column):
+        """Return the name of the single-column index of a column."""
+        self.env.cr.execute("""
+            SELECT idx.relname
+              FROM pg_index x
+              JOIN pg_class idx ON idx.oid = x.indexrelid
+              JOIN pg_class tbl ON tbl.oid = x.indrelid
+              JOIN pg_attribute att ON att.attrelid = tbl.oid AND att.attnum = x.indkey[0]
+             WHERE tbl.relname = %s AND att.attname = %s
+               AND x.indnatts = 1 AND x.indpred IS NULL
+        """, [table, column])
+        row = self.env.cr.fetchone()
+        self.assertTrue(row, "%s.%s is not indexed" % (table, column))
+        return row[0]
+
+    def _explain(self, model_name, domain):
+        query = self.env[model_name]._search(domain)
+        query.order = None
+        self.env.cr.execute("SET LOCAL enable_seqscan = off")
+        self.env.cr.execute(SQL("EXPLAIN %s", query.select()))
+        return '\n'.join(row[0] for row in self.env.cr.fetchall())
+
+    def assertIndexScan(self, model_name, domain, index_names):
+        """Assert that the plan of a domain reads one of the given indexes."""
+        plan = self._explain(model_name, domain)
+        self.assertNotIn('Seq Scan', plan, "%s %s:\n%s" % (model_name, domain, plan))
+        self.assertTrue(any(name in plan for name in index_names),
+                        "%s %s does not use %s:\n%s" % (model_name, domain, index_names, plan))
+
+    def test_01_contract_domains(self):
+        """Test the contract domains of the billing wizard and partner KPIs.
+        Verifies that:
+        - Expiring active contracts are read from the active contracts index
+        - Active contracts and contracts of clients are read from an index
+        """
+        Contract = self.env['it.outsource.contract']
+        table = 'it_outsource_contract'
+        active_end_date = 'it_outsource_contract_active_end_date_idx'
+        self.assertIndexScan(Contract._name, Contract._get_billing_domain(
+            include_active=False, include_expiring=True, days_to_expire=30), [active_end_date])
+        self.assertIndexScan(Contract._name, [('state', '=', 'active')],
+                             [active_end_date, self._get_column_index(table, 'state')])
+        self.assertIndexScan(Contract._name, [('partner_id', 'in', self.partners[:2].ids)],
+                             [self._get_column_index(table, 'partner_id')])
+
+    def test_02_invoice_domains(self):
+        """Test the invoice domains of the views and partner KPIs.
+        Verifies that:
+        - Invoices of contracts and clients are read from their index
+        - State, date and due date filters are read from their index
+        - Open and overdue invoices are read from the open invoices index
+        """
+        Invoice = self.env['it.outsource.invoice']
+        table = 'it_outsource_invoice'
+        today = date.today()
+        open_index = 'it_outsource_invoice_open_due_date_idx'
+        self.assertIndexScan(Invoice._name, [('contract_id', 'in', self.contracts[:10].ids)],
+                             [self._get_column_index(table, 'contract_id')])
+        self.assertIndexScan(Invoice._name, [('partner_id', 'in', self.partners[:2].ids),
+                                             ('state', '!=', 'cancelled')],
+                             [self._get_column_index(table, 'partner_id')])
+        self.assertIndexScan(Invoice._name, [('state', '=', 'sent')],
+                             [self._get_column_index(table, 'state')])
+        self.assertIndexScan(Invoice._name, [('date', '>=', today),
+                                             ('date', '<=', today + timedelta(days=60))],
+                             [self._get_column_index(table, 'date')])
+        self.assertIndexScan(Invoice._name, [('due_date', '<', today - timedelta(days=100))],
+                             [self._get_column_index(table, 'due_date')])
+        self.assertIndexScan(Invoice._name, [('residual', '>', 0),
+                                             ('state', 'in', ('draft', 'sent'))], [open_index])
+        self.assertIndexScan(Invoice._name, [('partner_id', 'in', self.partners[:2].ids),
+                                             ('state', 'in', ('draft', 'sent')),
+                                             ('residual', '>', 0),
+                                             ('due_date', '<', today)],
+                             [open_index])
+
+    def test_03_child_domains(self):
+        """Test the domains following the foreign keys of child records.
+        Verifies that:
+        - Lines and payments of invoices are read from their index
+        - Acts of contracts and their lines are read from their index
+        """
+        acts = self.env['it.outsource.service.act'].search(
+            [('contract_id', 'in', self.contracts[:10].ids)], limit=10)
+        self.assertTrue(acts)
+        self.assertIndexScan('it.outsource.invoice.line',
+                             [('invoice_id', 'in', self.invoices[:10].ids)],
+                             [self._get_column_index('it_outsource_invoice_line', 'invoice_id')])
+        self.assertIndexScan('it.outsource.payment',
+                             [('invoice_id', 'in', self.invoices[:10].ids),
+                              ('state', '=', 'confirmed')],
+                             [self._get_column_index('it_outsource_payment', 'invoice_id'),
+                              'it_outsource_payment_confirmed_invoice_idx'])
+        self.assertIndexScan('it.outsource.service.act',
+                             [('contract_id', 'in', self.contracts[:10].ids)],
+                             [self._get_column_index('it_outsource_service_act', 'contract_id')])
+        self.assertIndexScan('it.outsource.service.act.line',
+                             [('service_act_id', 'in', acts.ids)],
+                             [self._get_column_index('it_outsource_service_act_line', 'service_act_id')])
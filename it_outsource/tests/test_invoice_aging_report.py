@@ -0,0 +1,63 @@
+from datetime import date, timedelta
+from odoo.tests.common import TransactionCase
+
+
+class TestInvoiceAgingReport(TransactionCase):
+    """Test suite for the receivables aging report.
+    Attributes:
+        partner (res.partner): Test partner record
+        contract (it.outsource.contract): Active test contract
+    """
+
+    @classmethod
+    def setUpClass(cls):
+        """Set up test data for all test methods.
+        Creates the necessary test records:
+        - A test partner
+        - An active contract billing one server
+        """
+        super().setUpClass()
+        cls.partner = cls.env['res.partner'].create({'name': 'Test Client'})
+        server = cls.env['it.outsource.product'].create({
+            'name': 'Test Server',
+            'product_type': 'server',
+            'price': 1000.0,
+        })
+        cls.contract = cls.env['it.outsource.contract'].create({
+            'partner_id': cls.partner.id,
+            'start_date': date.today(),
+            'end_date': date.today() + timedelta(days=365),
+            'product_ids': [(4, server.id)],
+        })
+        cls.contract.action_activate()
+
+    def _create_invoice(self, invoice_date):
+        return self.env['it.outsource.invoice'].create({
+            'contract_id': self.contract.id,
+            'date': invoice_date,
+            'line_ids': [(0, 0, {
+                'product_type': 'server',
+                'quantity': 1,
+                'price_unit': 1000.0,
+            })],
+        })
+
+    def test_01_aging_buckets(self):
+        """Test that residuals land in the right aging bucket.
+        Verifies that:
+        - An invoice 45 days overdue is reported in the 31-60 bucket
+        - A recent invoice is reported in the 0-30 bucket
+        """
+        overdue = self._create_invoice(date.today() - timedelta(days=75))
+        recent = self._create_invoice(date.today())
+        Report = self.env['it.outsource.invoice.aging.report']
+        Report._cron_refresh()
+
+        overdue_line = Report.search([('invoice_id', '=', overdue.id)])
+        self.assertEqual(overdue_line.days_overdue, 45)
+        self.assertEqual(overdue_line.amount_31_60, 1000.0)
+        self.assertEqual(overdue_line.partner_id, self.partner)
+
+        recent_line = Report.search([('invoice_id', '=', recent.id)])
+        self.assertEqual(recent_line.amount_0_30, 1000.0)
+        self.assertEqual(recent_line.residual, 1000.0)
@@ -0,0 +1,66 @@
+import csv
+import io
+from datetime import date, timedelta
+
+from odoo.tests import HttpCase, tagged
+
+
+@tagged('post_install', '-at_install')
+class TestInvoiceExport(HttpCase):
+    """Test suite for the streaming invoice export.
+    Attributes:
+        invoices (it.outsource.invoice): Three invoices, one of them sent
+    """
+
+    @classmethod
+    def setUpClass(cls):
+        """Set up test data for all test methods.
+        Creates the necessary test records:
+        - Three active contracts billing a server and a service
+        - One invoice per contract dated in 2001, one of them sent
+        """
+        super().setUpClass()
+        partner = cls.env['res.partner'].create({'name': 'Export Client'})
+        products = cls.env['it.outsource.product'].create([{
+            'name': 'Export %s' % product_type,
+            'product_type': product_type,
+            'price': 100.0,
+        } for product_type in ('server', 'service')])
+        contracts = cls.env['it.outsource.contract'].create([{
+            'partner_id': partner.id,
+            'start_date': date.today(),
+            'end_date': date.today() + timedelta(days=365),
+            'product_ids': [(6, 0, products.ids)],
+        } for _i in range(3)])
+        cls.invoices = cls.env['it.outsource.invoice'].create([{
+            'contract_id': contract.id,
+            'date': date(2001, 1, 1),
+            'line_ids': [(0, 0, {
+                'product_type': product.product_type,
+                'product_id': product.id,
+                'price_unit': product.price,
+            }) for product in products],
+        } for contract in contracts])
+        cls.invoices[0].state = 'sent'
+
+    def _export(self, **params):
+        self.authenticate('admin', 'admin')
+        params.setdefault('date_from', '2001-01-01')
+        params.setdefault('date_to', '2001-01-31')
+        query = '&'.join('%s=%s' % item for item in params.items())
+        response = self.url_open('/it_outsource/export/invoices?%s' % query)
+        self.assertEqual(response.status_code, 200)
+        return list(csv.reader(io.StringIO(response.content.decode())))
+
+    def test_01_export_lines(self):
+        """Test the streamed invoice export.
+        Verifies that:
+        - One row is exported per invoice line, after the header
+        - The state filter restricts the exported invoices
+        """
+        rows = self._export()
+        self.assertEqual(rows[0][0], 'Invoice')
+        self.assertEqual(len(rows), 1 + 6)
+
+        rows = self._export(state='sent', detail='invoice')
+        self.assertEqual([row[0] for row in rows[1:]], [self.invoices[0].name])
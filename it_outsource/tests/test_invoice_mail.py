@@ -0,0 +1,79 @@
+from datetime import date, timedelta
+from odoo import fields
+from odoo.tests.common import TransactionCase
+
+
+class TestInvoiceMail(TransactionCase):
+    """Test suite for queued invoice e-mailing.
+    Attributes:
+        invoices (it.outsource.invoice): Three draft test invoices
+    """
+
+    @classmethod
+    def setUpClass(cls):
+        """Set up test data for all test methods.
+        Creates the necessary test records:
+        - Three active contracts of a client with an e-mail address
+        - One draft invoice per contract
+        """
+        super().setUpClass()
+        partner = cls.env['res.partner'].create({
+            'name': 'Test Client',
+            'email': 'test@example.com',
+        })
+        server = cls.env['it.outsource.product'].create({
+            'name': 'Test Server',
+            'product_type': 'server',
+            'price': 1000.0,
+        })
+        contracts = cls.env['it.outsource.contract'].create([{
+            'partner_id': partner.id,
+            'start_date': date.today(),
+            'end_date': date.today() + timedelta(days=365),
+            'product_ids': [(4, server.id)],
+        } for _i in range(3)])
+        contracts.action_activate()
+        cls.invoices = cls.env['it.outsource.invoice'].browse(
+            contracts._create_invoices(date.today()))
+
+    def test_01_mass_send_is_queued_and_throttled(self):
+        """Test sending a selection of invoices.
+        Verifies that:
+        - One queued mail is created per invoice
+        - Mails are spread at the rate, beyond it to the next minute
+        - All invoices are marked as sent
+        """
+        self.env['ir.config_parameter'].sudo().set_param('it_outsource.invoice_mail_rate', 2)
+        mails = self.invoices._send_mails(batch_size=2)
+        self.assertEqual(len(mails), 3)
+        self.assertEqual(set(mails.mapped('state')), {'outgoing'})
+        scheduled = sorted(mails.mapped('scheduled_date'))
+        self.assertEqual(scheduled[1] - scheduled[0], timedelta(seconds=30))
+        self.assertEqual(scheduled[2] - scheduled[0], timedelta(minutes=1))
+
+        self.invoices.action_send()
+        self.assertEqual(set(self.invoices.mapped('state')), {'sent'})
+
+    def test_02_consecutive_sends_share_the_rate(self):
+        """Test two sends queued one after the other.
+        Verifies that:
+        - The second send is scheduled after the slots of the first one
+        """
+        self.env['ir.config_parameter'].sudo().set_param('it_outsource.invoice_mail_rate', 2)
+        first = self.invoices[:2]._send_mails()
+        second = self.invoices[2:]._send_mails()
+        self.assertEqual(second.scheduled_date - max(first.mapped('scheduled_date')),
+                         timedelta(seconds=30))
+
+    def test_03_missing_schedule_parameter(self):
+        """Test sending when the schedule parameter was removed.
+        Verifies that:
+        - The parameter is created again and moved past the queued mails
+        """
+        Param = self.env['ir.config_parameter'].sudo()
+        Param.set_param('it_outsource.invoice_mail_rate', 2)
+        Param.search([('key', '=', 'it_outsource.invoice_mail_next_slot')]).unlink()
+        mails = self.invoices._send_mails()
+        next_slot = Param.search([('key', '=', 'it_outsource.invoice_mail_next_slot')]).value
+        self.assertEqual(fields.Datetime.to_datetime(next_slot) - min(mails.mapped('scheduled_date')),
+                         timedelta(seconds=90))
@@ -0,0 +1,108 @@
+from datetime import date, timedelta
+from odoo.tests.common import TransactionCase
+from odoo.exceptions import ValidationError
+
+
+class TestInvoicePayment(TransactionCase):
+    """Test suite for invoice balances maintained from payments.
+    Attributes:
+        contract (it.outsource.contract): Active test contract
+        invoices (it.outsource.invoice): Two sent invoices of 1000.0
+    """
+
+    @classmethod
+    def setUpClass(cls):
+        """Set up test data for all test methods.
+        Creates the necessary test records:
+        - A test partner, server and active contract
+        - Two sent invoices of 1000.0
+        """
+        super().setUpClass()
+        partner = cls.env['res.partner'].create({'name': 'Test Client'})
+        server = cls.env['it.outsource.product'].create({
+            'name': 'Test Server',
+            'product_type': 'server',
+            'price': 1000.0,
+        })
+        cls.contract = cls.env['it.outsource.contract'].create({
+            'partner_id': partner.id,
+            'start_date': date.today(),
+            'end_date': date.today() + timedelta(days=365),
+            'product_ids': [(4, server.id)],
+        })
+        cls.contract.action_activate()
+        cls.invoices = cls.env['it.outsource.invoice'].create([{
+            'contract_id': cls.contract.id,
+            'date': date.today(),
+            'state': 'sent',
+            'line_ids': [(0, 0, {
+                'product_type': 'server',
+                'product_id': server.id,
+                'quantity': 1,
+                'price_unit': 1000.0,
+            })],
+        } for _i in range(2)])
+
+    def _create_payment(self, invoice, amount, **vals):
+        return self.env['it.outsource.payment'].create(dict({
+            'invoice_id': invoice.id,
+            'amount': amount,
+            'payment_method': 'bank',
+            'date': date.today(),
+        }, **vals))
+
+    def test_01_only_confirmed_payments_count(self):
+        """Test stored paid amount and residual.
+        Verifies that:
+        - Draft payments do not change the balance
+        - Confirmed payments do, cancelled and deleted ones no longer do
+        - Open invoices can be searched on the stored residual
+        """
+        invoice = self.invoices[0]
+        payment = self._create_payment(invoice, 400.0)
+        self.assertEqual(invoice.paid_amount, 0.0)
+
+        payment.state = 'confirmed'
+        self.assertEqual(invoice.paid_amount, 400.0)
+        self.assertEqual(invoice.residual, 600.0)
+        unpaid = self.env['it.outsource.invoice'].search([
+            ('residual', '>', 0), ('state', 'in', ('draft', 'sent')),
+            ('id', 'in', self.invoices.ids)])
+        self.assertEqual(unpaid, self.invoices)
+
+        payment.write({'state': 'canceled', 'cancel_reason': 'Bounced'})
+        self.assertEqual(invoice.residual, 1000.0)
+
+        other = self._create_payment(invoice, 250.0, state='confirmed')
+        self.assertEqual(invoice.residual, 750.0)
+        other.unlink()
+        self.assertEqual(invoice.residual, 1000.0)
+
+    def test_02_batch_confirm(self):
+        """Test confirming payments of several invoices at once.
+        Verifies that:
+        - All selected payments are confirmed
+        - Fully paid invoices are marked paid, partially paid ones are not
+        """
+        payments = (
+            self._create_payment(self.invoices[0], 600.0)
+            | self._create_payment(self.invoices[0], 400.0)
+            | self._create_payment(self.invoices[1], 300.0)
+        )
+        self.assertTrue(payments.action_confirm())
+        self.assertEqual(set(payments.mapped('state')), {'confirmed'})
+        self.assertEqual(self.invoices[0].state, 'paid')
+        self.assertEqual(self.invoices[1].state, 'sent')
+        self.assertEqual(self.invoices[1].residual, 700.0)
+
+    def test_03_batch_confirm_exceeding_residual(self):
+        """Test that a group of payments cannot exceed the invoice balance.
+        Verifies that:
+        - Payments whose sum exceeds the residual are rejected together
+        """
+        payments = (
+            self._create_payment(self.invoices[0], 600.0)
+            | self._create_payment(self.invoices[0], 600.0)
+        )
+        with self.assertRaises(ValidationError):
+            payments.action_confirm()
@@ -0,0 +1,114 @@
+import os
+import tempfile
+from datetime import date, timedelta
+from odoo.tests.common import TransactionCase
+
+
+class TestInvoiceReport(TransactionCase):
+    """Test suite for the cached invoice PDF.
+    Attributes:
+        invoice (it.outsource.invoice): Draft test invoice
+    """
+
+    @classmethod
+    def setUpClass(cls):
+        """Set up test data for all test methods.
+        Creates the necessary test records:
+        - An active contract billing one server
+        - A draft invoice of the contract
+        """
+        super().setUpClass()
+        partner = cls.env['res.partner'].create({'name': 'Test Client'})
+        server = cls.env['it.outsource.product'].create({
+            'name': 'Test Server',
+            'product_type': 'server',
+            'price': 1000.0,
+        })
+        contract = cls.env['it.outsource.contract'].create({
+            'partner_id': partner.id,
+            'start_date': date.today(),
+            'end_date': date.today() + timedelta(days=365),
+            'product_ids': [(4, server.id)],
+        })
+        contract.action_activate()
+        cls.invoice = cls.env['it.outsource.invoice'].browse(
+            contract._create_invoices(date.today() + timedelta(days=40)))
+
+    def test_01_attachment_name_follows_content(self):
+        """Test that the cached PDF is keyed by the printed content.
+        Verifies that:
+        - The attachment name is stable while the invoice is unchanged
+        - Changing a line changes the attachment name
+        - Changes that are not printed keep the name
+        """
+        name = self.invoice._get_report_attachment_name()
+        self.assertEqual(self.invoice._get_report_attachment_name(), name)
+        self.assertTrue(name.startswith(self.invoice._get_report_base_filename()))
+
+        self.invoice.proration_note = 'Not printed'
+        self.assertEqual(self.invoice._get_report_attachment_name(), name)
+
+        self.invoice.line_ids.price_unit = 900.0
+        self.assertNotEqual(self.invoice._get_report_attachment_name(), name)
+
+    def test_02_report_values(self):
+        """Test the precomputed values passed to the invoice template.
+        Verifies that:
+        - Client and contract names are provided per invoice
+        - Lines are provided as plain values
+        - The report renders from these values
+        """
+        Report = self.env['report.it_outsource.report_server_rental_invoice_document']
+        values = Report._get_report_values(self.invoice.ids)['doc_values'][self.invoice.id]
+        self.assertEqual(values['partner_name'], 'Test Client')
+        self.assertEqual(values['contract_name'], self.invoice.contract_id.name)
+        self.assertEqual(values['lines'], [{
+            'product_name': 'Test Server',
+            'description': 'Test Server',
+            'quantity': 1.0,
+            'price_unit': 1000.0,
+            'amount': 1000.0,
+        }])
+
+        html, _format = self.env['ir.actions.report']._render_qweb_html(
+            'it_outsource.action_report_server_rental_invoice', self.invoice.ids)
+        self.assertIn(b'Test Client', html)
+
+    def test_03_outdated_pdf_is_removed(self):
+        """Test that a document keeps a single cached PDF.
+        Verifies that:
+        - The cached PDF of the current content is kept
+        - The cached PDF of an outdated content is removed
+        - Other PDFs attached to the document are kept
+        """
+        Attachment = self.env['ir.attachment']
+        cached, other = Attachment.create([{
+            'name': name,
+            'res_model': 'it.outsource.invoice',
+            'res_id': self.invoice.id,
+            'raw': b'%PDF-1.4',
+        } for name in (self.invoice._get_report_attachment_name(), 'Signed contract.pdf')])
+        self.invoice._unlink_stale_report_attachments()
+        self.assertTrue(cached.exists())
+
+        self.invoice.line_ids.price_unit = 900.0
+        self.invoice._unlink_stale_report_attachments()
+        self.assertFalse(cached.exists())
+        self.assertTrue(other.exists())
+
+    def test_04_pdf_attachment_from_file(self):
+        """Test storing a merged PDF from its file on disk.
+        Verifies that:
+        - The attachment serves the content of the file
+        - The size is taken from the file
+        """
+        content = b'%PDF-1.4 merged'
+        with tempfile.TemporaryDirectory() as tmpdir:
+            path = os.path.join(tmpdir, 'merged.pdf')
+            with open(path, 'wb') as pdf_file:
+                pdf_file.write(content)
+            attachment = self.invoice._create_pdf_attachment(
+                path, {'name': 'Merged.pdf', 'res_model': 'it.outsource.invoice'})
+        self.assertEqual(attachment.raw, content)
+        self.assertEqual(attachment.file_size, len(content))
+        self.assertEqual(attachment.mimetype, 'application/pdf')
@@ -0,0 +1,172 @@
+from datetime import date, timedelta
+
+from psycopg2 import IntegrityError
+
+from odoo.tests.common import TransactionCase
+from odoo.tools import date_utils, mute_logger
+
+
+class TestInvoiceWizard(TransactionCase):
+    """Test suite for the invoice generation wizard.
+    Attributes:
+        partner (res.partner): Test partner record
+        server (it.outsource.product): Test server product record
+        service (it.outsource.product): Test service product record
+        contracts (it.outsource.contract): Active test contracts
+    """
+
+    @classmethod
+    def setUpClass(cls):
+        """Set up test data for all test methods.
+        Creates the necessary test records:
+        - A test partner
+        - Two test products (server and service)
+        - Three active contracts billing both products
+        """
+        super().setUpClass()
+        cls.partner = cls.env['res.partner'].create({'name': 'Test Client'})
+        cls.server = cls.env['it.outsource.product'].create({
+            'name': 'Test Server',
+            'product_type': 'server',
+            'price': 1000.0,
+        })
+        cls.service = cls.env['it.outsource.product'].create({
+            'name': 'Test Service',
+            'product_type': 'service',
+            'price': 500.0,
+        })
+        cls.contracts = cls.env['it.outsource.contract'].create([{
+            'partner_id': cls.partner.id,
+            'start_date': date.today(),
+            'end_date': date.today() + timedelta(days=365),
+            'product_ids': [(6, 0, (cls.server | cls.service).ids)],
+        } for _i in range(3)])
+        cls.contracts.action_activate()
+
+    def test_01_generate_invoices(self):
+        """Test batched invoice generation.
+        Verifies that:
+        - One invoice is created per active contract
+        - Every invoice bills all contract products
+        - The returned action lists exactly the created invoices
+        """
+        # bill the first full month of the contracts
+        wizard = self.env['it.outsource.invoice.wizard'].create({
+            'date': date.today() + timedelta(days=40),
+        })
+        action = wizard.action_generate_invoices()
+        invoices = self.env['it.outsource.invoice'].search(action['domain'])
+        self.assertEqual(invoices.contract_id, self.contracts)
+        self.assertEqual(len(invoices), 3)
+        for invoice in invoices:
+            self.assertEqual(len(invoice.line_ids), 2)
+            self.assertEqual(invoice.amount, 1500.0)
+
+    def test_02_create_invoices_in_small_batches(self):
+        """Test that batch size does not change the result.
+        Verifies that:
+        - Creating invoices one contract per batch returns all invoices
+        """
+        invoice_ids = self.contracts._create_invoices(date.today(), batch_size=1)
+        self.assertEqual(len(invoice_ids), 3)
+
+    def test_03_bulk_sequence_numbers(self):
+        """Test bulk sequence allocation for batch-created invoices.
+        Verifies that:
+        - Every invoice of the batch gets its own sequence number
+        - Numbers follow the invoice sequence prefix
+        """
+        invoice_ids = self.contracts._create_invoices(date.today())
+        names = self.env['it.outsource.invoice'].browse(invoice_ids).mapped('name')
+        self.assertEqual(len(set(names)), 3)
+        for name in names:
+            self.assertTrue(name.startswith('INV/'))
+
+    def test_04_rerun_skips_billed_period(self):
+        """Test that re-running the wizard for a billed period is a no-op.
+        Verifies that:
+        - Invoices carry the billing period
+        - A second run for the same month creates no invoices
+        - Creating a duplicate invoice for the period is rejected
+        """
+        wizard = self.env['it.outsource.invoice.wizard'].create({
+            'date': date.today(),
+        })
+        action = wizard.action_generate_invoices()
+        invoices = self.env['it.outsource.invoice'].search(action['domain'])
+        self.assertEqual(set(invoices.mapped('period_start')), {date.today().replace(day=1)})
+
+        action = wizard.action_generate_invoices()
+        self.assertFalse(self.env['it.outsource.invoice'].search(action['domain']))
+
+        with self.assertRaises(IntegrityError), mute_logger('odoo.sql_db'):
+            self.contracts[0]._create_invoices(date.today())
+            self.env.flush_all()
+
+    def test_05_prorate_partial_period(self):
+        """Test proration of contracts starting within the billed month.
+        Verifies that:
+        - Fixed prices are billed for the days the contract runs
+        - The invoice explains the proration
+        """
+        invoice_date = date.today().replace(day=1) + timedelta(days=40)
+        period_start = invoice_date.replace(day=1)
+        period_days = ((period_start + timedelta(days=32)).replace(day=1) - period_start).days
+        contract = self.contracts[0]
+        contract.start_date = period_start + timedelta(days=10)
+
+        invoice_ids = contract._create_invoices(invoice_date)
+        invoice = self.env['it.outsource.invoice'].browse(invoice_ids)
+        fraction = (period_days - 10) / period_days
+        self.assertAlmostEqual(invoice.amount, 1500.0 * fraction, places=2)
+        self.assertIn('%s of %s days' % (period_days - 10, period_days), invoice.proration_note)
+
+    def test_06_bulk_sequence_numbers_of_documents(self):
+        """Test bulk sequence allocation for the other batch-created documents.
+        Verifies that:
+        - Contracts created together get distinct contract numbers
+        - Payments created together get distinct payment numbers
+        - Service acts generated together get distinct act numbers
+        """
+        contracts = self.env['it.outsource.contract'].create([{
+            'partner_id': self.partner.id,
+            'start_date': date.today(),
+            'end_date': date.today() + timedelta(days=365),
+        } for _i in range(2)])
+        self.assertEqual(len(set(contracts.mapped('number'))), 2)
+        for contract in contracts:
+            self.assertTrue(contract.number.startswith('CON/'))
+
+        invoice_date = date.today() + timedelta(days=40)
+        invoices = self.env['it.outsource.invoice'].browse(
+            self.contracts._create_invoices(invoice_date))
+        payments = self.env['it.outsource.payment'].create([{
+            'invoice_id': invoice.id,
+            'amount': 100.0,
+            'date': invoice_date,
+            'payment_method': 'bank',
+        } for invoice in invoices])
+        self.assertEqual(len(set(payments.mapped('name'))), 3)
+        for name in payments.mapped('name'):
+            self.assertTrue(name.startswith('PAY/'))
+
+        Act = self.env['it.outsource.service.act']
+        acts = Act.browse(Act._generate_acts(invoice_date))
+        self.assertEqual(len(set(acts.mapped('name'))), 3)
+        for name in acts.mapped('name'):
+            self.assertTrue(name.startswith('SRP/'))
+
+    def test_07_skip_contract_outside_period(self):
+        """Test billing a month in which a contract does not run.
+        Verifies that:
+        - No invoice is created for the contract
+        - The contract is not selected as unbilled for the month
+        """
+        contract = self.contracts[0]
+        contract.start_date = date_utils.start_of(date.today(), 'month') + timedelta(days=40)
+
+        self.assertFalse(contract._create_invoices(date.today()))
+        period_start = date_utils.start_of(date.today(), 'month')
+        unbilled = self.env['it.outsource.contract']._search_unbilled(
+            [('id', 'in', self.contracts.ids)], period_start)
+        self.assertEqual(unbilled, self.contracts - contract)
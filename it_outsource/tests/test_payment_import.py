@@ -0,0 +1,176 @@
+import base64
+from datetime import date, timedelta
+from odoo.tests.common import TransactionCase
+
+
+class TestPaymentImport(TransactionCase):
+    """Test suite for the bank statement import.
+    Attributes:
+        partner (res.partner): Test partner record
+        invoice (it.outsource.invoice): Sent test invoice of 1000.0
+    """
+
+    @classmethod
+    def setUpClass(cls):
+        """Set up test data for all test methods.
+        Creates the necessary test records:
+        - A test partner, server and active contract
+        - A sent invoice of 1000.0
+        """
+        super().setUpClass()
+        cls.partner = cls.env['res.partner'].create({'name': 'Statement Client'})
+        server = cls.env['it.outsource.product'].create({
+            'name': 'Test Server',
+            'product_type': 'server',
+            'price': 1000.0,
+        })
+        contract = cls.env['it.outsource.contract'].create({
+            'partner_id': cls.partner.id,
+            'start_date': date.today(),
+            'end_date': date.today() + timedelta(days=365),
+            'product_ids': [(4, server.id)],
+        })
+        contract.action_activate()
+        cls.invoice = cls.env['it.outsource.invoice'].create({
+            'contract_id': contract.id,
+            'state': 'sent',
+            'line_ids': [(0, 0, {
+                'product_type': 'server',
+                'quantity': 1,
+                'price_unit': 1000.0,
+            })],
+        })
+
+    def _import_csv(self, content):
+        wizard = self.env['it.outsource.payment.import.wizard'].create({
+            'data_file': base64.b64encode(content.encode()),
+            'filename': 'statement.csv',
+            'file_format': 'csv',
+        })
+        wizard.action_import()
+        return wizard
+
+    def _get_statement_csv(self):
+        today = date.today().isoformat()
+        return '\n'.join([
+            'date,amount,reference,partner,account',
+            f'{today},400.00,Payment {self.invoice.name},Statement Client,UA001',
+            f'{today},250.00,Unknown transfer,Statement Client,UA001',
+            f'{today},-80.00,Bank fee,,',
+        ])
+
+    def test_01_import_csv(self):
+        """Test importing a CSV bank statement.
+        Verifies that:
+        - A line referencing an invoice number becomes a confirmed payment
+          linked to its matched statement line, reducing the invoice residual
+        - A line without a known reference is kept as unmatched
+        - Outgoing transfers are skipped
+        """
+        wizard = self._import_csv(self._get_statement_csv())
+        self.assertEqual(
+            (wizard.matched_count, wizard.unmatched_count, wizard.skipped_count), (1, 1, 1))
+
+        payment = self.invoice.payment_ids
+        self.assertEqual(payment.amount, 400.0)
+        self.assertEqual(payment.state, 'confirmed')
+        self.assertEqual(self.invoice.residual, 600.0)
+        self.assertEqual(payment.statement_line_id.state, 'matched')
+        self.assertEqual(payment.statement_line_id.account_number, 'UA001')
+
+        unmatched = self.env['it.outsource.bank.statement.line'].search(
+            [('import_ref', '=', wizard.import_ref), ('state', '=', 'unmatched')])
+        self.assertEqual(unmatched.amount, 250.0)
+        self.assertEqual(unmatched.partner_id, self.partner)
+
+    def test_02_match_unmatched_lines(self):
+        """Test the automatic matching engine.
+        Verifies that:
+        - A transfer of the exact balance is applied as a confirmed payment
+        - A smaller transfer of the same client is only proposed
+        """
+        Line = self.env['it.outsource.bank.statement.line']
+        exact, partial = Line.create([{
+            'date': date.today(),
+            'amount': amount,
+            'partner_id': self.partner.id,
+        } for amount in (1000.0, 300.0)])
+        (exact | partial).action_match()
+
+        self.assertEqual(exact.state, 'matched')
+        self.assertEqual(exact.payment_ids.invoice_id, self.invoice)
+        self.assertEqual(exact.payment_ids.state, 'confirmed')
+        self.assertEqual(self.invoice.state, 'paid')
+        # the balance was consumed by the first line, nothing is left to propose
+        self.assertEqual(partial.state, 'unmatched')
+
+    def test_03_reimport_is_skipped(self):
+        """Test importing the same statement twice.
+        Verifies that:
+        - Transfers of the first import are reported as duplicates
+        - No payment or statement line is created again
+        """
+        content = self._get_statement_csv()
+        self._import_csv(content)
+        Line = self.env['it.outsource.bank.statement.line']
+        line_count = Line.search_count([])
+
+        wizard = self._import_csv(content)
+        self.assertEqual(
+            (wizard.matched_count, wizard.unmatched_count, wizard.duplicate_count), (0, 0, 2))
+        self.assertEqual(len(self.invoice.payment_ids), 1)
+        self.assertEqual(Line.search_count([]), line_count)
+
+    def test_04_identical_transfers(self):
+        """Test importing transfers that only differ by their transaction id.
+        Verifies that:
+        - Identical transfers of one statement without transaction id are
+          all imported
+        - A transfer with a transaction id is skipped when another statement
+          already imported it, even if the files differ
+        """
+        today = date.today().isoformat()
+        wizard = self._import_csv('\n'.join([
+            'date,amount,reference,partner',
+            f'{today},50.00,,',
+            f'{today},50.00,,',
+        ]))
+        self.assertEqual((wizard.unmatched_count, wizard.duplicate_count), (2, 0))
+
+        wizard = self._import_csv('\n'.join([
+            'date,amount,reference,partner,transaction_id',
+            f'{today},75.00,,,TX-1',
+            f'{today},75.00,,,TX-2',
+        ]))
+        self.assertEqual((wizard.unmatched_count, wizard.duplicate_count), (2, 0))
+        wizard = self._import_csv('\n'.join([
+            'date,amount,reference,partner,transaction_id',
+            f'{today},75.00,,,TX-2',
+            f'{today},75.00,,,TX-3',
+        ]))
+        self.assertEqual((wizard.unmatched_count, wizard.duplicate_count), (1, 1))
+
+    def test_05_overpayment_stays_proposed(self):
+        """Test a transfer exceeding the residual of its invoice.
+        Verifies that:
+        - The invoice is paid up to its residual
+        - The line keeps its unallocated remainder and stays proposed
+        """
+        Line = self.env['it.outsource.bank.statement.line']
+        line = Line.create({
+            'date': date.today(),
+            'amount': 1500.0,
+            'partner_id': self.partner.id,
+            'state': 'proposed',
+            'match_invoice_ids': [(4, self.invoice.id)],
+        })
+        line.action_apply_match()
+
+        self.assertEqual(line.payment_ids.amount, 1000.0)
+        self.assertEqual(line.payment_ids.state, 'confirmed')
+        self.assertEqual(self.invoice.state, 'paid')
+        self.assertEqual(line.state, 'proposed')
+
+        # applying it again does not pay the invoice twice
+        line.action_apply_match()
+        self.assertEqual(len(line.payment_ids), 1)
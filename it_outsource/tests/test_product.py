@@ -0,0 +1,63 @@
+from datetime import date, timedelta
+from odoo.exceptions import ValidationError
+from odoo.tests.common import TransactionCase
+
+
+class TestProduct(TransactionCase):
+    """Test suite for the server allocation of rental products.
+    Attributes:
+        partner (res.partner): Test partner record
+        contract (it.outsource.contract): Draft test contract
+        small (it.outsource.product): Small available server
+        large (it.outsource.product): Large available server
+    """
+
+    @classmethod
+    def setUpClass(cls):
+        """Set up test data for all test methods.
+        Creates the necessary test records:
+        - A test partner and a draft contract
+        - A small and a large available server
+        """
+        super().setUpClass()
+        cls.partner = cls.env['res.partner'].create({'name': 'Test Client'})
+        cls.contract = cls.env['it.outsource.contract'].create({
+            'partner_id': cls.partner.id,
+            'start_date': date.today(),
+            'end_date': date.today() + timedelta(days=30),
+        })
+        cls.small, cls.large = cls.env['it.outsource.product'].create([{
+            'name': 'Small Server',
+            'product_type': 'server',
+            'price': 500.0,
+            'cpu_count': 4,
+            'ram_gb': 16.0,
+            'disk_space_gb': 500.0,
+        }, {
+            'name': 'Large Server',
+            'product_type': 'server',
+            'price': 2000.0,
+            'cpu_count': 32,
+            'ram_gb': 256.0,
+            'disk_space_gb': 4000.0,
+        }])
+
+    def test_01_allocate_best_fit(self):
+        """Test that the smallest matching server is allocated.
+        Verifies that:
+        - The small server is picked for a small request
+        - The server is rented and attached to the contract
+        """
+        servers = self.contract._allocate_servers(cpu_count=2, ram_gb=8.0)
+
+        self.assertEqual(servers, self.small)
+        self.assertEqual(self.small.state, 'rented')
+        self.assertIn(self.small, self.contract.product_ids)
+        self.assertEqual(self.large.state, 'available')
+
+    def test_02_allocate_insufficient(self):
+        """Test that nothing is allocated when too few servers match."""
+        with self.assertRaises(ValidationError):
+            self.contract._allocate_servers(cpu_count=8, count=2)
+        self.assertEqual(self.large.state, 'available')
+        self.assertFalse(self.contract.product_ids)
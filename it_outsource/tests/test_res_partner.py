@@ -0,0 +1,58 @@
+from datetime import date, timedelta
+from odoo.tests.common import TransactionCase
+
+
+class TestResPartner(TransactionCase):
+    """Test suite for the partner rental KPIs.
+    Attributes:
+        partner (res.partner): Test partner record
+        contract (it.outsource.contract): Active test contract
+    """
+
+    @classmethod
+    def setUpClass(cls):
+        """Set up test data for all test methods.
+        Creates the necessary test records:
+        - A test partner with one active and one draft contract
+        - An overdue invoice and a recent invoice of 1000.0 each
+        """
+        super().setUpClass()
+        cls.partner = cls.env['res.partner'].create({
+            'name': 'Test Client',
+            'is_rental_client': True,
+        })
+        server = cls.env['it.outsource.product'].create({
+            'name': 'Test Server',
+            'product_type': 'server',
+            'price': 1000.0,
+        })
+        contracts = cls.env['it.outsource.contract'].create([{
+            'partner_id': cls.partner.id,
+            'start_date': date.today(),
+            'end_date': date.today() + timedelta(days=365),
+            'product_ids': [(4, server.id)],
+        } for _i in range(2)])
+        contracts[0].action_activate()
+        cls.env['it.outsource.invoice'].create([{
+            'contract_id': contracts[0].id,
+            'date': invoice_date,
+            'state': 'sent',
+            'line_ids': [(0, 0, {
+                'product_type': 'server',
+                'quantity': 1,
+                'price_unit': 1000.0,
+            })],
+        } for invoice_date in (date.today() - timedelta(days=60), date.today())])
+
+    def test_01_rental_kpis(self):
+        """Test the batch-computed partner KPIs.
+        Verifies that:
+        - All and active contracts are counted
+        - Invoiced, due and overdue amounts are aggregated
+        """
+        partner = self.partner
+        self.assertEqual(partner.contract_count, 2)
+        self.assertEqual(partner.active_contract_count, 1)
+        self.assertEqual(partner.rental_invoiced_amount, 2000.0)
+        self.assertEqual(partner.rental_due_amount, 2000.0)
+        self.assertEqual(partner.rental_overdue_amount, 1000.0)
@@ -0,0 +1,69 @@
+from datetime import date, timedelta
+from odoo.tests.common import TransactionCase
+
+
+class TestServiceAct(TransactionCase):
+    """Test suite for the service act generation.
+    Attributes:
+        partner (res.partner): Test partner record
+        server (it.outsource.product): Test server product record
+        contracts (it.outsource.contract): Two active test contracts
+    """
+
+    @classmethod
+    def setUpClass(cls):
+        """Set up test data for all test methods.
+        Creates the necessary test records:
+        - A test partner and a test server
+        - Two active contracts billing the server
+        """
+        super().setUpClass()
+        cls.partner = cls.env['res.partner'].create({'name': 'Test Client'})
+        cls.server = cls.env['it.outsource.product'].create({
+            'name': 'Test Server',
+            'product_type': 'server',
+            'price': 1000.0,
+        })
+        cls.contracts = cls.env['it.outsource.contract'].create([{
+            'partner_id': cls.partner.id,
+            'start_date': date.today(),
+            'end_date': date.today() + timedelta(days=365),
+            'product_ids': [(4, cls.server.id)],
+        } for _i in range(2)])
+        cls.contracts.action_activate()
+
+    def test_01_generate_from_invoices(self):
+        """Test act generation from the invoices of the period.
+        Verifies that:
+        - One act is created per invoice, linked to it
+        - Act lines copy the invoice lines
+        - Re-running the generation creates nothing
+        """
+        invoice_date = date.today() + timedelta(days=40)
+        invoices = self.env['it.outsource.invoice'].browse(
+            self.contracts._create_invoices(invoice_date))
+        Act = self.env['it.outsource.service.act']
+
+        acts = Act.browse(Act._generate_acts(invoice_date))
+        self.assertEqual(acts.invoice_id, invoices)
+        for act in acts:
+            self.assertEqual(act.amount_total, act.invoice_id.amount)
+            self.assertEqual(act.line_ids.product_id, self.server)
+
+        self.assertFalse(Act._generate_acts(invoice_date))
+
+    def test_02_generate_from_contracts(self):
+        """Test act generation from the contract products.
+        Verifies that:
+        - One act is created per active contract without an act
+        - A contract already having an act for the period is skipped
+        """
+        act_date = date.today() + timedelta(days=40)
+        Act = self.env['it.outsource.service.act']
+        self.contracts[0]._create_invoices(act_date)
+        Act._generate_acts(act_date)
+
+        acts = Act.browse(Act._generate_acts(act_date, source='contract'))
+        self.assertIn(self.contracts[1], acts.contract_id)
+        self.assertNotIn(self.contracts[0], acts.contract_id)
+        self.assertFalse(acts.invoice_id)
@@ -0,0 +1,65 @@
+import json
+from datetime import date, timedelta
+
+from odoo.tests import HttpCase, tagged
+
+
+@tagged('post_install', '-at_install')
+class TestSyncApi(HttpCase):
+    """Test suite for the keyset-paginated sync API.
+    Attributes:
+        invoices (it.outsource.invoice): Three test invoices
+    """
+
+    @classmethod
+    def setUpClass(cls):
+        """Set up test data for all test methods.
+        Creates the necessary test records:
+        - Three active contracts billing one server
+        - One invoice per contract
+        """
+        super().setUpClass()
+        partner = cls.env['res.partner'].create({'name': 'Test Client'})
+        server = cls.env['it.outsource.product'].create({
+            'name': 'Test Server',
+            'product_type': 'server',
+            'price': 1000.0,
+        })
+        contracts = cls.env['it.outsource.contract'].create([{
+            'partner_id': partner.id,
+            'start_date': date.today(),
+            'end_date': date.today() + timedelta(days=365),
+            'product_ids': [(4, server.id)],
+        } for _i in range(3)])
+        contracts.action_activate()
+        cls.invoices = cls.env['it.outsource.invoice'].browse(
+            contracts._create_invoices(date.today()))
+
+    def test_01_paginate_invoices(self):
+        """Test walking all pages of the invoice endpoint.
+        Verifies that:
+        - Following next_cursor returns every invoice exactly once
+        - Invoices embed their lines
+        """
+        self.authenticate('admin', 'admin')
+        since = min(self.invoices.mapped('write_date')).isoformat()
+        url = '/it_outsource/api/invoices?limit=2&since=%s' % since
+        seen = []
+        while url:
+            page = json.loads(self.url_open(url).content)
+            seen.extend(page['records'])
+            url = page['next_cursor'] and '/it_outsource/api/invoices?limit=2&cursor=%s' % page['next_cursor']
+
+        ids = [vals['id'] for vals in seen]
+        self.assertEqual(len(ids), len(set(ids)))
+        self.assertTrue(set(self.invoices.ids) <= set(ids))
+        for vals in seen:
+            if vals['id'] in self.invoices.ids:
+                self.assertEqual(len(vals['lines']), 1)
+                self.assertEqual(vals['payments'], [])
+
+    def test_02_invalid_cursor(self):
+        """Test that a malformed cursor is rejected."""
+        self.authenticate('admin', 'admin')
+        response = self.url_open('/it_outsource/api/invoices?cursor=nope')
+        self.assertEqual(response.status_code, 400)
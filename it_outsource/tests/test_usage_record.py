@@ -0,0 +1,115 @@
+from datetime import date, timedelta
+from psycopg2 import IntegrityError
+from odoo.exceptions import ValidationError
+from odoo.tests.common import TransactionCase
+from odoo.tools import date_utils, mute_logger
+
+
+class TestUsageRecord(TransactionCase):
+    """Test suite for usage ingestion and usage billing.
+    Attributes:
+        partner (res.partner): Test partner record
+        server (it.outsource.product): Fixed-price test server
+        support (it.outsource.product): Usage-billed support service
+        contract (it.outsource.contract): Active test contract
+    """
+
+    @classmethod
+    def setUpClass(cls):
+        """Set up test data for all test methods.
+        Creates the necessary test records:
+        - A test partner
+        - A fixed-price server and a support service billed per hour
+        - An active contract billing both products
+        """
+        super().setUpClass()
+        cls.partner = cls.env['res.partner'].create({'name': 'Test Client'})
+        cls.server = cls.env['it.outsource.product'].create({
+            'name': 'Test Server',
+            'product_type': 'server',
+            'price': 1000.0,
+        })
+        cls.support = cls.env['it.outsource.product'].create({
+            'name': 'Support',
+            'product_type': 'service',
+            'price': 50.0,
+            'billing_method': 'usage',
+            'usage_unit': 'hours',
+        })
+        cls.contract = cls.env['it.outsource.contract'].create({
+            'partner_id': cls.partner.id,
+            'start_date': date.today(),
+            'end_date': date.today() + timedelta(days=365),
+            'product_ids': [(6, 0, (cls.server | cls.support).ids)],
+        })
+        cls.contract.action_activate()
+
+    def test_01_bill_usage(self):
+        """Test that usage of the billed month is aggregated into one line.
+        Verifies that:
+        - All records are ingested
+        - Usage outside the billed month is ignored
+        - The usage line bills the summed quantity at the unit price
+        """
+        # bill the first full month of the contract
+        invoice_date = date.today() + timedelta(days=40)
+        month_start = date_utils.start_of(invoice_date, 'month')
+        rows = [(self.contract.id, self.support.id, month_start, 1.5)] * 4
+        rows.append((self.contract.id, self.support.id, month_start - timedelta(days=1), 10.0))
+        count = self.env['it.outsource.usage.record']._ingest(iter(rows), batch_size=2)
+        self.assertEqual(count, 5)
+
+        invoice_ids = self.contract._create_invoices(invoice_date)
+        invoice = self.env['it.outsource.invoice'].browse(invoice_ids)
+        line = invoice.line_ids.filtered(lambda line: line.product_id == self.support)
+        self.assertEqual(line.quantity, 6.0)
+        self.assertEqual(invoice.amount, 1300.0)
+
+    def test_02_records_are_append_only(self):
+        """Test that usage records cannot be modified or deleted."""
+        self.env['it.outsource.usage.record']._ingest(
+            [(self.contract.id, self.support.id, date.today(), 1.0)])
+        record = self.env['it.outsource.usage.record'].search(
+            [('contract_id', '=', self.contract.id)])
+        with self.assertRaises(ValidationError):
+            record.write({'quantity': 2.0})
+        with self.assertRaises(ValidationError):
+            record.unlink()
+
+    def test_03_ingest_validates_rows(self):
+        """Test the public ingestion entry point.
+        Verifies that:
+        - Valid rows are inserted
+        - Rows of a product the contract does not bill are refused
+        - Rows of an inactive contract are refused
+        - Negative quantities are refused
+        """
+        Usage = self.env['it.outsource.usage.record']
+        row = {
+            'contract_id': self.contract.id,
+            'product_id': self.support.id,
+            'date': date.today().isoformat(),
+            'quantity': 2.0,
+        }
+        self.assertEqual(Usage.ingest([row, row]), 2)
+
+        other = self.env['it.outsource.product'].create({
+            'name': 'Traffic',
+            'product_type': 'service',
+            'price': 1.0,
+            'billing_method': 'usage',
+        })
+        draft = self.contract.copy({'state': 'draft'})
+        for invalid in (dict(row, product_id=other.id),
+                        dict(row, contract_id=draft.id),
+                        dict(row, quantity=-1.0)):
+            with self.assertRaises(ValidationError):
+                Usage.ingest([row, invalid])
+
+    def test_04_contract_with_usage_cannot_be_deleted(self):
+        """Test that deleting a contract does not erase its usage history."""
+        self.env['it.outsource.usage.record']._ingest(
+            [(self.contract.id, self.support.id, date.today(), 1.0)])
+        with self.assertRaises(IntegrityError), mute_logger('odoo.sql_db'):
+            self.contract.unlink()
+            self.env.flush_all()
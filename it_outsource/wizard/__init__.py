@@ -1 +1 @@
-from . import invoice_wizard
+from . import invoice_wizard, invoice_export_wizard, payment_import_wizard, server_allocation_wizard, service_act_wizard
@@ -0,0 +1,49 @@
+from urllib.parse import urlencode
+
+from odoo import models, fields
+
+
+class InvoiceExportWizard(models.TransientModel):
+    """Wizard for exporting invoices for BI.
+    This wizard collects the export filters and downloads the file from the
+    streaming export endpoint, which writes rows as they are read instead
+    of building the whole file in memory.
+    """
+    _name = 'it.outsource.invoice.export.wizard'
+    _description = 'Invoice Export Wizard'
+
+    date_from = fields.Date(string='From')
+    date_to = fields.Date(string='To')
+    state = fields.Selection([
+        ('draft', 'Draft'),
+        ('sent', 'Sent'),
+        ('paid', 'Paid'),
+        ('cancelled', 'Cancelled')
+    ], string='Status', help='Export invoices of all statuses when empty')
+    detail = fields.Selection([
+        ('line', 'One Row per Invoice Line'),
+        ('invoice', 'One Row per Invoice')
+    ], required=True, default='line')
+    file_format = fields.Selection([
+        ('csv', 'CSV'),
+        ('xlsx', 'Excel')
+    ], required=True, default='csv')
+
+    def action_export(self):
+        """Download the export.
+        Returns:
+            dict: URL action to the streaming export endpoint
+        """
+        self.ensure_one()
+        params = {'detail': self.detail, 'file_format': self.file_format}
+        if self.date_from:
+            params['date_from'] = fields.Date.to_string(self.date_from)
+        if self.date_to:
+            params['date_to'] = fields.Date.to_string(self.date_to)
+        if self.state:
+            params['state'] = self.state
+        return {
+            'type': 'ir.actions.act_url',
+            'url': '/it_outsource/export/invoices?%s' % urlencode(params),
+            'target': 'self',
+        }
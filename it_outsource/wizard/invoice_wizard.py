@@ -1,6 +1,6 @@
-from datetime import date, timedelta
 from odoo import models, fields, api, _
 from odoo.exceptions import ValidationError
+from odoo.tools import date_utils
 
 
 class InvoiceWizard(models.TransientModel):
@@ -51,6 +51,18 @@ class InvoiceWizard(models.TransientModel):
             if wizard.due_date < wizard.date:
                 raise ValidationError(_('Due date cannot be before invoice date.'))
 
+    def _get_contract_domain(self):
+        """Return the domain of contracts selected by the wizard.
+        Returns:
+            list: Search domain, or None when no contract is selected
+        """
+        self.ensure_one()
+        return self.env['it.outsource.contract']._get_billing_domain(
+            include_active=self.include_active,
+            include_expiring=self.include_expiring,
+            days_to_expire=self.days_to_expire,
+        )
+
     def action_generate_invoices(self):
         """Generate invoices for selected contracts.
         This method generates invoices for each selected contract, including
@@ -59,56 +71,14 @@ class InvoiceWizard(models.TransientModel):
             dict: Action to view the created invoices
         """
         self.ensure_one()
-        Contract = self.env['it.outsource.contract']
-
-        # Base domain for active contracts
-        domain = [('state', '=', 'active')]
-
-        # Build conditions based on wizard selections
-        conditions = []
-        if self.include_active:
-            conditions.append([])  # All active contracts
-
-        if self.include_expiring:
-            expiration_date = (date.today() +
-                               timedelta(days=self.days_to_expire))
-            conditions.append([('end_date', '<=', expiration_date)])
-
-        # Combine conditions with OR if both are selected
-        if len(conditions) > 1:
-            domain = ['|'] + conditions[0] + conditions[1]
-        elif conditions:
-            domain += conditions[0]
-        else:
+        domain = self._get_contract_domain()
+        if domain is None:
             return {'type': 'ir.actions.act_window_close'}
 
-        # Find matching contracts
-        contracts = Contract.search(domain)
-
-        # Batch create invoices with lines
-        invoices = self.env['it.outsource.invoice']
-        for contract in contracts:
-            # Prepare invoice values
-            invoice_vals = {
-                'contract_id': contract.id,
-                'date': self.date,
-                'line_ids': []
-            }
-
-            # Add products/services from contract to invoice lines
-            for product in contract.product_ids:
-                line_vals = {
-                    'product_type': product.product_type,
-                    'product_id': product.id,
-                    'quantity': 1,
-                    'price_unit': product.price,
-                    'description': product.name,
-                }
-                invoice_vals['line_ids'].append((0, 0, line_vals))
-
-            # Create invoice
-            invoice = self.env['it.outsource.invoice'].create(invoice_vals)
-            invoices += invoice
+        # Find matching contracts not billed for the period yet
+        period_start = date_utils.start_of(self.date, 'month')
+        contracts = self.env['it.outsource.contract']._search_unbilled(domain, period_start)
+        invoice_ids = contracts._create_invoices(self.date)
 
         # Return action to view created invoices
         return {
@@ -116,6 +86,30 @@ class InvoiceWizard(models.TransientModel):
             'type': 'ir.actions.act_window',
             'res_model': 'it.outsource.invoice',
             'view_mode': 'tree,form',
-            'domain': [('id', 'in', invoices.ids)],
+            'domain': [('id', 'in', invoice_ids)],
             'context': {'create': False},
         }
+
+    def action_schedule_billing_job(self):
+        """Schedule a background billing run for the selected contracts.
+        Instead of billing inside the HTTP request, a billing job is created
+        and the billing cron is triggered to process it in chunks.
+        Returns:
+            dict: Action to view the scheduled billing job
+        """
+        self.ensure_one()
+        job = self.env['it.outsource.billing.job'].create({
+            'date': self.date,
+            'include_active': self.include_active,
+            'include_expiring': self.include_expiring,
+            'days_to_expire': self.days_to_expire,
+        })
+        job.action_start()
+        return {
+            'name': 'Billing Job',
+            'type': 'ir.actions.act_window',
+            'res_model': 'it.outsource.billing.job',
+            'view_mode': 'form',
+            'res_id': job.id,
+            'target': 'current',
+        }
@@ -0,0 +1,166 @@
+import csv
+import io
+
+from lxml import etree
+
+from odoo import models, fields, _
+from odoo.exceptions import ValidationError
+
+
+class PaymentImportWizard(models.TransientModel):
+    """Wizard for importing bank statements.
+    This wizard reads a CSV or CAMT.053 bank statement as a stream, creates
+    payments for the lines referencing an invoice number and keeps the other
+    lines as unmatched statement lines. Transfers imported by an earlier
+    statement are skipped. A transfer is identified by the transaction id
+    given by the bank or, when the statement has none, by the hash of the
+    file and the position of the transfer in it.
+    """
+    _name = 'it.outsource.payment.import.wizard'
+    _description = 'Bank Statement Import Wizard'
+
+    data_file = fields.Binary(
+        string='Statement File',
+        required=True,
+        help='CSV file with date, amount, reference, partner and optional '
+             'account and transaction_id columns, or a CAMT.053 XML statement'
+    )
+    filename = fields.Char()
+    file_format = fields.Selection([
+        ('csv', 'CSV'),
+        ('camt', 'CAMT.053 XML')
+    ], required=True, default='csv')
+    csv_delimiter = fields.Char(default=',', size=1)
+
+    state = fields.Selection([
+        ('upload', 'Upload'),
+        ('done', 'Done')
+    ], default='upload')
+    import_ref = fields.Char(readonly=True)
+    matched_count = fields.Integer(string='Payments Created', readonly=True)
+    unmatched_count = fields.Integer(string='Unmatched Lines', readonly=True)
+    skipped_count = fields.Integer(string='Skipped Lines', readonly=True,
+                                   help='Outgoing transfers are ignored')
+    duplicate_count = fields.Integer(string='Duplicate Lines', readonly=True,
+                                     help='Transfers already imported by an earlier statement')
+
+    def _get_data_attachment(self):
+        return self.env['ir.attachment'].sudo().search([
+            ('res_model', '=', self._name),
+            ('res_field', '=', 'data_file'),
+            ('res_id', '=', self.id),
+        ], limit=1)
+
+    def _open_data_file(self, attachment):
+        """Open the uploaded file as a binary stream.
+        The file is read from the filestore when possible, so it is never
+        held in memory as a whole.
+        Args:
+            attachment (ir.attachment): Attachment of the uploaded file
+        Returns:
+            file: Binary file object
+        """
+        if attachment.store_fname:
+            return open(attachment._full_path(attachment.store_fname), 'rb')
+        return io.BytesIO(attachment.raw or b'')
+
+    def _read_csv(self, fileobj, file_hash):
+        """Yield the rows of a CSV statement one by one.
+        Args:
+            fileobj (file): Binary file object of the statement
+            file_hash (str): Checksum of the statement file
+        """
+        reader = csv.DictReader(
+            io.TextIOWrapper(fileobj, encoding='utf-8-sig', newline=''),
+            delimiter=self.csv_delimiter or ',')
+        for number, row in enumerate(reader, start=2):
+            try:
+                yield {
+                    'unique_import_id': ((row.get('transaction_id') or '').strip()
+                                         or '%s-%s' % (file_hash, number)),
+                    'date': fields.Date.to_date(row['date'].strip()),
+                    'amount': float(row['amount'].replace(' ', '').replace(',', '.')),
+                    'reference': (row.get('reference') or '').strip(),
+                    'partner_name': (row.get('partner') or '').strip(),
+                    'account_number': (row.get('account') or '').strip(),
+                }
+            except (KeyError, ValueError, AttributeError) as e:
+                raise ValidationError(_('Invalid statement line %(line)s: %(error)s',
+                                        line=number, error=e))
+
+    def _read_camt(self, fileobj, file_hash):
+        """Yield the entries of a CAMT.053 statement one by one.
+        Entries are parsed incrementally and cleared once read, so memory
+        use does not grow with the size of the statement. Entries are
+        identified by the reference given by the bank, AcctSvcrRef or else
+        NtryRef.
+        Args:
+            fileobj (file): Binary file object of the statement
+            file_hash (str): Checksum of the statement file
+        """
+        entries = etree.iterparse(fileobj, events=('end',), tag='{*}Ntry')
+        for number, (_event, entry) in enumerate(entries, start=1):
+            sign = -1 if entry.findtext('{*}CdtDbtInd') == 'DBIT' else 1
+            reference = (entry.findtext('.//{*}RmtInf/{*}Ustrd')
+                         or entry.findtext('.//{*}CdtrRefInf/{*}Ref')
+                         or '')
+            partner_name = (entry.findtext('.//{*}RltdPties/{*}Dbtr/{*}Nm')
+                            or entry.findtext('.//{*}RltdPties/{*}Dbtr/{*}Pty/{*}Nm')
+                            or '')
+            account_number = (entry.findtext('.//{*}RltdPties/{*}DbtrAcct/{*}Id/{*}IBAN')
+                              or entry.findtext('.//{*}RltdPties/{*}DbtrAcct/{*}Id/{*}Othr/{*}Id')
+                              or '')
+            unique_import_id = (entry.findtext('{*}AcctSvcrRef')
+                                or entry.findtext('{*}NtryRef')
+                                or '')
+            yield {
+                'unique_import_id': unique_import_id.strip() or '%s-%s' % (file_hash, number),
+                'date': fields.Date.to_date(entry.findtext('{*}BookgDt/{*}Dt')
+                                            or entry.findtext('{*}ValDt/{*}Dt')),
+                'amount': sign * float(entry.findtext('{*}Amt')),
+                'reference': reference.strip(),
+                'partner_name': partner_name.strip(),
+                'account_number': account_number.strip(),
+            }
+            entry.clear()
+            while entry.getprevious() is not None:
+                del entry.getparent()[0]
+
+    def action_import(self):
+        """Import the statement and show the import summary.
+        Returns:
+            dict: Action reopening the wizard with the summary
+        """
+        self.ensure_one()
+        import_ref = '%s (%s)' % (self.filename or _('Statement'), fields.Datetime.now())
+        reader = self._read_camt if self.file_format == 'camt' else self._read_csv
+        attachment = self._get_data_attachment()
+        with self._open_data_file(attachment) as fileobj:
+            summary = self.env['it.outsource.bank.statement.line']._import_rows(
+                reader(fileobj, attachment.checksum), import_ref)
+        self.write({
+            'state': 'done',
+            'import_ref': import_ref,
+            'matched_count': summary['matched'],
+            'unmatched_count': summary['unmatched'],
+            'skipped_count': summary['skipped'],
+            'duplicate_count': summary['duplicate'],
+        })
+        return {
+            'type': 'ir.actions.act_window',
+            'res_model': self._name,
+            'view_mode': 'form',
+            'res_id': self.id,
+            'target': 'new',
+        }
+
+    def action_view_unmatched(self):
+        self.ensure_one()
+        return {
+            'name': _('Unmatched Statement Lines'),
+            'type': 'ir.actions.act_window',
+            'res_model': 'it.outsource.bank.statement.line',
+            'view_mode': 'tree,form',
+            'domain': [('import_ref', '=', self.import_ref), ('state', '!=', 'matched')],
+            'context': {'create': False},
+        }
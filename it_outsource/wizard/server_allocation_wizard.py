@@ -0,0 +1,35 @@
+from odoo import models, fields
+
+
+class ServerAllocationWizard(models.TransientModel):
+    """Wizard for allocating servers to a contract.
+    This wizard takes the required server specifications and attaches the
+    best fitting available servers to the contract.
+    """
+    _name = 'it.outsource.server.allocation.wizard'
+    _description = 'Server Allocation Wizard'
+
+    contract_id = fields.Many2one(
+        comodel_name='it.outsource.contract',
+        string='Contract',
+        required=True
+    )
+    cpu_count = fields.Integer(string='Min. CPU Count')
+    ram_gb = fields.Float(string='Min. RAM (GB)')
+    disk_space_gb = fields.Float(string='Min. Disk Space (GB)')
+    count = fields.Integer(
+        string='Number of Servers',
+        default=1,
+        required=True
+    )
+
+    def action_allocate(self):
+        """Allocate the servers and close the wizard."""
+        self.ensure_one()
+        self.contract_id._allocate_servers(
+            cpu_count=self.cpu_count,
+            ram_gb=self.ram_gb,
+            disk_space_gb=self.disk_space_gb,
+            count=self.count,
+        )
+        return {'type': 'ir.actions.act_window_close'}
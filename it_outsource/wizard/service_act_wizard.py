@@ -0,0 +1,41 @@
+from odoo import models, fields
+
+
+class ServiceActWizard(models.TransientModel):
+    """Wizard for generating service acts.
+    This wizard creates the work completion certificates of a billing
+    period, either from the period's invoices or from the products of the
+    active contracts.
+    """
+    _name = 'it.outsource.service.act.wizard'
+    _description = 'Service Act Generation Wizard'
+
+    date = fields.Date(
+        string='Act Date',
+        required=True,
+        default=fields.Date.context_today,
+        help='Date of the acts, the acts cover the month of this date'
+    )
+    source = fields.Selection([
+        ('invoice', 'Invoices of the Period'),
+        ('contract', 'Active Contracts')
+    ], required=True,
+        default='invoice',
+        help='Documents the act lines are taken from')
+
+    def action_generate_acts(self):
+        """Generate the missing acts of the period.
+        Returns:
+            dict: Action to view the created acts
+        """
+        self.ensure_one()
+        act_ids = self.env['it.outsource.service.act']._generate_acts(
+            self.date, source=self.source)
+        return {
+            'name': 'Generated Acts',
+            'type': 'ir.actions.act_window',
+            'res_model': 'it.outsource.service.act',
+            'view_mode': 'tree,form',
+            'domain': [('id', 'in', act_ids)],
+            'context': {'create': False},
+        }